@@ -10,6 +10,10 @@ import time
 # Setup logger for this module
 logger = logging.getLogger(__name__)
 
+# Precompiled little-endian layout of a path event after its marker byte:
+# 4-byte value, signed longitude, signed latitude, unsigned elevation
+_EVENT = struct.Struct('<IiiI')
+
 class BMWDecoder(BaseDecoder):
     def __init__(self):
         super().__init__()
@@ -43,7 +47,8 @@ class BMWDecoder(BaseDecoder):
     
     def format_entry_for_xlsx(self, entry: GPSEntry) -> List[Any]:
         """Format a GPSEntry into a row for the XLSX file"""
-        self._logger.debug(f"Formatting entry for XLSX: lat={entry.latitude}, lon={entry.longitude}")
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(f"Formatting entry for XLSX: lat={entry.latitude}, lon={entry.longitude}")
 
         row = [
             entry.extra_data.get('TrailId', ''),
@@ -93,18 +98,16 @@ class BMWDecoder(BaseDecoder):
                 self._logger.warning("Processing stopped by user before trail read")
                 return [], "Processing stopped by user."
 
-            # Get all trails
-            cursor.execute("SELECT * FROM Trails")
+            # Get all trails, selecting only the four columns used in a fixed order so rows unpack directly
+            cursor.execute("SELECT TrailId, BeginCoordinatedUniversalTime, EndCoordinatedUniversalTime, Path FROM Trails")
             trails = cursor.fetchall()
+            trail_count = len(trails)
             
-            # Get column names
-            column_names = [description[0] for description in cursor.description]
-            
-            self._logger.info(f"Found {len(trails)} trails in database")
+            self._logger.info(f"Found {trail_count} trails in database")
             
             if progress_callback:
-                progress_callback(f"Processing {len(trails)} trails...", 50)
-                self._log_progress(f"Processing {len(trails)} trails", 50)
+                progress_callback(f"Processing {trail_count} trails...", 50)
+                self._log_progress(f"Processing {trail_count} trails", 50)
                 
             if stop_event and stop_event.is_set():
                 conn.close()
@@ -114,21 +117,19 @@ class BMWDecoder(BaseDecoder):
             entries = []
             valid_entries = 0
             invalid_entries = 0
+            debug = self._logger.isEnabledFor(logging.DEBUG)
+            # The bar only has 30 steps for this stage, so report about that often instead of per trail
+            report_step = max(1, trail_count // 30)
+            log_step = max(1, trail_count // 10)
             
-            for i, trail in enumerate(trails):
+            for i, (trail_id, begin_time, end_time, path_data) in enumerate(trails):
                 if stop_event and stop_event.is_set():
                     conn.close()
-                    self._logger.warning(f"Processing stopped by user at trail {i}/{len(trails)}")
+                    self._logger.warning(f"Processing stopped by user at trail {i}/{trail_count}")
                     return entries, "Processing stopped by user."
 
-                self._logger.debug(f"Processing trail {i+1}/{len(trails)}")
-                
-                trail_dict = dict(zip(column_names, trail))
-                
-                trail_id = trail_dict['TrailId']
-                begin_time = trail_dict['BeginCoordinatedUniversalTime']
-                end_time = trail_dict['EndCoordinatedUniversalTime']
-                path_data = trail_dict['Path']
+                if debug:
+                    self._logger.debug(f"Processing trail {i+1}/{trail_count}")
                 
                 # Convert timestamps to ISO format
                 begin_time_iso = self.unix_to_iso(begin_time)
@@ -157,10 +158,13 @@ class BMWDecoder(BaseDecoder):
                 else:
                     # Add each GPS event as a separate row
                     for event in events:
-                        if self.is_valid_coordinates(event['latitude'], event['longitude']):
+                        lat = event['latitude']
+                        lon = event['longitude']
+                        # Same checks as is_valid_coordinates inline, decoded coordinates are never None
+                        if -90 <= lat <= 90 and -180 <= lon <= 180 and (lat != 0 or lon != 0):
                             gps_entry = GPSEntry(
-                                latitude=event['latitude'],
-                                longitude=event['longitude'],
+                                latitude=lat,
+                                longitude=lon,
                                 timestamp=begin_time_iso if begin_time_iso else '',
                                 extra_data={
                                     **base_record,
@@ -174,15 +178,16 @@ class BMWDecoder(BaseDecoder):
                             valid_entries += 1
                         else:
                             invalid_entries += 1
-                            self._logger.debug(f"Invalid coordinates in trail {trail_id}: {event['latitude']}, {event['longitude']}")
+                            if debug:
+                                self._logger.debug(f"Invalid coordinates in trail {trail_id}: {lat}, {lon}")
 
-                if progress_callback and len(trails) > 0:
-                    progress = 50 + (30 * (i + 1) // len(trails))
-                    progress_callback(f"Processing trail {i+1}/{len(trails)}", progress)
+                if progress_callback and (i % report_step == 0 or i % log_step == 0 or i + 1 == trail_count):
+                    progress = 50 + (30 * (i + 1) // trail_count)
+                    progress_callback(f"Processing trail {i+1}/{trail_count}", progress)
                     
                     # Log progress every 10%
-                    if i % max(1, len(trails) // 10) == 0:
-                        self._log_progress(f"Processing trails ({i+1}/{len(trails)})", progress)
+                    if i % log_step == 0:
+                        self._log_progress(f"Processing trails ({i+1}/{trail_count})", progress)
 
             conn.close()
             
@@ -252,6 +257,7 @@ class BMWDecoder(BaseDecoder):
         if len(path_data) < 8:
             return events
             
+        debug = self._logger.isEnabledFor(logging.DEBUG)
         try:
             # BMW format is different from Mercedes - look for marker bytes directly
             i = 0
@@ -261,17 +267,8 @@ class BMWDecoder(BaseDecoder):
                         # Parse BMW format entry
                         marker = path_data[i]
                         
-                        # 4-byte value (unsigned)
-                        value = struct.unpack('<I', path_data[i+1:i+5])[0]
-                        
-                        # Longitude (signed 32-bit)
-                        lon_encoded = struct.unpack('<i', path_data[i+5:i+9])[0]
-                        
-                        # Latitude (signed 32-bit)
-                        lat_encoded = struct.unpack('<i', path_data[i+9:i+13])[0]
-                        
-                        # Elevation (unsigned 32-bit)
-                        elevation = struct.unpack('<I', path_data[i+13:i+17])[0]
+                        # Value, longitude, latitude and elevation read in place in one call
+                        value, lon_encoded, lat_encoded, elevation = _EVENT.unpack_from(path_data, i + 1)
                         
                         # Decode coordinates
                         lon = self.decode_gps_coordinate(lon_encoded)
@@ -286,7 +283,8 @@ class BMWDecoder(BaseDecoder):
                             'value': value
                         })
                         
-                        self._logger.debug(f"BMW GPS event: marker={hex(marker)}, value={value}, lat={lat:.6f}, lon={lon:.6f}, elev={elevation}")
+                        if debug:
+                            self._logger.debug(f"BMW GPS event: marker={hex(marker)}, value={value}, lat={lat:.6f}, lon={lon:.6f}, elev={elevation}")
                         
                         # Move to next entry (17 bytes total)
                         i += 17
@@ -1,13 +1,19 @@
 import os
 import sys
+import mmap
+import re
 import struct
 import sqlite3
+import shutil
 import tempfile
+import itertools
+from collections import deque
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import List, Tuple, Optional, Any, BinaryIO
 import logging
 import time
+from functools import lru_cache
 
 # Import base classes
 from src.core.base_decoder import BaseDecoder, GPSEntry
@@ -23,6 +29,163 @@ except ImportError:
     TSK_AVAILABLE = False
     logger.warning("pytsk3 module not available - Honda decoder functionality will be limited")
 
+try:
+    import ciso8601
+    CISO8601_AVAILABLE = True
+except ImportError:
+    CISO8601_AVAILABLE = False
+
+# ext4 superblock lives 1024 bytes into the partition, magic number (0xEF53) at +56
+EXT4_MAGIC = b'\x53\xEF'
+EXT4_MAGIC_OFFSET = 1024 + 56
+EXT4_MAX_SEARCH = 500 * 1024 * 1024  # Search first 500MB
+EXT4_SCAN_WINDOW = 64 * 1024 * 1024  # Size of each scan window
+# Partitions start on sector boundaries (GPT addresses them in 512-byte LBAs, and Honda
+# eMMC layouts are MiB-aligned in practice), so only those offsets are tested for a superblock
+EXT4_PARTITION_ALIGN = 512
+EXT4_MIN_INODES = 16  # Plausible s_inodes_count range for a real filesystem
+EXT4_MAX_INODES = 1 << 28
+# s_inodes_count, s_blocks_count_lo and s_log_block_size (block size is 1024 << value)
+_EXT4_SUPERBLOCK = struct.Struct('<II16xI')
+
+# GPT header fields at offset 72 (entries LBA, entry count, entry size) and one partition
+# entry (type GUID, unique GUID, first LBA, last LBA, attributes, UTF-16LE name)
+_GPT_HDR = struct.Struct('<QII')
+_GPT_ENT = struct.Struct('<16s16sQQQ72s')
+_ZERO16 = b'\x00' * 16
+
+# Markers expected near the start of a Honda image: a GPT header, the userdata partition
+# name (GPT names are UTF-16LE) or Honda telematics paths
+QUICK_REJECT_SIZE = 16 * 1024 * 1024
+QUICK_REJECT_MARKERS = (b'EFI PART', 'userdata'.encode('utf-16le'), b'com.honda', b'crm.db')
+MBR_SIGNATURE_OFFSET = 510  # Boot signature closing the first sector of an MBR-partitioned disk
+MBR_SIGNATURE = b'\x55\xaa'
+
+PARTITION_COPY_CHUNK = 8 * 1024 * 1024  # Buffered partition copy chunk
+SENDFILE_CHUNK = 64 * 1024 * 1024  # Bytes per sendfile call, bounds how long a stop request waits
+
+# How often long loops poll the stop event
+STOP_CHECK_BYTES = 64 * 1024 * 1024
+STOP_CHECK_ENTRIES = 64
+
+COPY_LOG_MASK = 128 * 1024 * 1024 - 1  # Log partition copy progress every 128MB (power of two, so a mask test)
+
+ECO_LOGS_FETCH_SIZE = 10000  # Rows pulled from SQLite per fetchmany call
+
+TSK_READ_CHUNK = 1024 * 1024  # Copy files out of the image 1MB at a time
+
+# File names (lowercased) accepted as the CRM database, and directory names worth
+# descending into when searching for it
+CRM_DB_NAMES = frozenset((b'crm.db',))
+CRM_SEARCH_KEYWORDS = (b'honda', b'telematics', b'data', b'app')
+CRM_SEARCH_KEYWORDS_RE = re.compile(b'|'.join(CRM_SEARCH_KEYWORDS))
+CRM_SEARCH_MAX_DEPTH = 10  # Deepest directory level searched
+# Top-level directories walked ahead of the others, in priority order
+CRM_SEARCH_FIRST = {'/data': 0, '/userdata': 1}
+
+# String timestamp formats accepted, in the order they are tried
+TIMESTAMP_FORMATS = (
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M:%SZ',
+    '%Y-%m-%dT%H:%M:%S.%fZ'
+)
+# The same strings in their zero-padded form, these can take the ISO parser instead of strptime
+TIMESTAMP_ISO_RE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}(?: [0-9]{2}:[0-9]{2}:[0-9]{2}(?:\.[0-9]{1,6})?'
+                              r'|T[0-9]{2}:[0-9]{2}:[0-9]{2}(?:\.[0-9]{1,6})?Z?)')
+
+TIMESTAMP_CACHE_SIZE = 131072  # Formatted timestamps kept per cache, values repeat across start/finish pairs
+
+
+
+def _fmt_datetime(dt: datetime) -> str:
+    """Format a datetime as 'YYYY-MM-DD HH:MM:SS.mmm' from its fields, skipping strftime and the slice"""
+    return (f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} "
+            f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}.{dt.microsecond // 1000:03d}")
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def _fmt_epoch_ms(timestamp) -> str:
+    """Format a Unix timestamp in seconds or milliseconds as a UTC string, cached since rows cluster in time"""
+    ts = timestamp / 1000.0 if timestamp > 1e12 else timestamp
+    return _fmt_datetime(datetime.fromtimestamp(ts, tz=timezone.utc))
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def _fmt_timestamp_str(timestamp: str, first_format: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Format a string timestamp as a UTC string
+    
+    Returns:
+        Tuple of (formatted string or None, legacy strptime format that matched or None)
+    """
+    # Fast path: ISO 8601 covers most of the string formats we see. ciso8601 parses it
+    # in a single C pass. Only strings one of TIMESTAMP_FORMATS also matches take it, so
+    # date-only and UTC offset strings are still exported as stored
+    if TIMESTAMP_ISO_RE.fullmatch(timestamp):
+        try:
+            if CISO8601_AVAILABLE:
+                dt = ciso8601.parse_datetime(timestamp)
+            else:
+                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+            return _fmt_datetime(dt), None
+        except ValueError:
+            pass
+    
+    # Try parsing as Unix timestamp string
+    try:
+        return _fmt_epoch_ms(float(timestamp)), None
+    except ValueError:
+        pass
+    
+    # Fall back to the legacy formats
+    formats = TIMESTAMP_FORMATS if first_format is None else (first_format,) + TIMESTAMP_FORMATS
+    for fmt in formats:
+        try:
+            dt = datetime.strptime(timestamp, fmt)
+        except ValueError:
+            continue
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return _fmt_datetime(dt), fmt
+    
+    return None, None
+
+def _find_superblock(buf, base: int, start: int, end: int) -> Optional[Tuple[int, int]]:
+    """
+    Search a buffer holding the image from offset `base` for the lowest valid
+    ext4 superblock whose partition offset lies in [start, end).
+    
+    Only partition offsets that are multiples of EXT4_PARTITION_ALIGN are tested.
+    """
+    # Only sector-aligned partition starts are candidates, so gather the first magic byte
+    # of every aligned slot with a strided slice and search that instead of every byte
+    first_offset = -(-start // EXT4_PARTITION_ALIGN) * EXT4_PARTITION_ALIGN
+    first = first_offset - base + EXT4_MAGIC_OFFSET
+    stop = min(end - base + EXT4_MAGIC_OFFSET, len(buf) - 1)
+    if first >= stop:
+        return None
+    magic_lo = buf[first:stop:EXT4_PARTITION_ALIGN]
+    
+    slot = magic_lo.find(EXT4_MAGIC[0])
+    while slot != -1:
+        pos = first + slot * EXT4_PARTITION_ALIGN
+        superblock = pos - EXT4_MAGIC_OFFSET + 1024
+        
+        if buf[pos + 1] == EXT4_MAGIC[1] and superblock + 1024 <= len(buf):
+            # Inode count, block count and block size come from one precompiled unpack
+            inodes_count, block_count, log_block_size = _EXT4_SUPERBLOCK.unpack_from(buf, superblock)
+            
+            # Sanity check
+            if (EXT4_MIN_INODES <= inodes_count <= EXT4_MAX_INODES and block_count > 1000 and
+                    log_block_size <= 2):
+                return base + pos - EXT4_MAGIC_OFFSET, block_count * (1024 << log_block_size)
+        
+        slot = magic_lo.find(EXT4_MAGIC[0], slot + 1)
+    
+    return None
+
+
 class HondaDecoder(BaseDecoder):
     """
     Honda CRM Database Decoder
@@ -32,6 +195,9 @@ class HondaDecoder(BaseDecoder):
     def __init__(self):
         super().__init__()
         self.temp_files = []  # Track temporary files for cleanup
+        self._temp_dir = None  # Private directory holding all extracted files, created on first use
+        self._temp_file_seq = itertools.count(1)
+        self._last_timestamp_format = None  # Last strptime format that matched
         self._logger.info("HondaDecoder initialized")
         self._logger.debug(f"TSK available: {TSK_AVAILABLE}")
     
@@ -63,7 +229,8 @@ class HondaDecoder(BaseDecoder):
     
     def format_entry_for_xlsx(self, entry: GPSEntry) -> List[Any]:
         """Format a GPSEntry into a row for the XLSX file"""
-        self._logger.debug(f"Formatting entry for XLSX: lat={entry.latitude}, lon={entry.longitude}")
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(f"Formatting entry for XLSX: lat={entry.latitude}, lon={entry.longitude}")
         
         row = [
             entry.latitude if entry.latitude != 0 else 'ERROR',
@@ -100,8 +267,13 @@ class HondaDecoder(BaseDecoder):
         entries = []
         
         try:
-            # Check file size
-            file_size = os.path.getsize(file_path)
+            # One stat call both confirms the file exists and gives its size
+            try:
+                file_size = os.stat(file_path).st_size
+            except FileNotFoundError:
+                error_msg = f"File not found: {file_path}"
+                self._logger.error(error_msg)
+                return [], error_msg
             self._logger.info(f"Processing Honda image: {file_path} (Size: {file_size/1024/1024:.2f} MB)")
             
             if progress_callback:
@@ -113,17 +285,19 @@ class HondaDecoder(BaseDecoder):
                 self._logger.warning("Processing stopped by user before analysis")
                 return [], "Processing stopped by user."
             
-            # Validate file exists and has reasonable size
-            if not os.path.exists(file_path):
-                error_msg = f"File not found: {file_path}"
-                self._logger.error(error_msg)
-                return [], error_msg
-            
+            # Validate file has reasonable size
             if file_size < 1024 * 1024:  # Less than 1MB
                 error_msg = "File appears too small to be a valid Android image"
                 self._logger.warning(f"{error_msg}: {file_size} bytes")
                 return [], error_msg
             
+            # Cheap look at the start of the file before committing to a full partition scan
+            if self._quick_reject(file_path):
+                error_msg = "File does not appear to contain Honda telematics data"
+                self._logger.warning(f"{error_msg}: no partition table, known markers or ext4 superblock in the first "
+                                   f"{QUICK_REJECT_SIZE/1024/1024:.0f} MB")
+                return [], error_msg
+            
             if progress_callback:
                 progress_callback("Searching for userdata partition...", 10)
                 self._log_progress("Searching for userdata partition", 10)
@@ -206,35 +380,96 @@ class HondaDecoder(BaseDecoder):
             self._cleanup_temp_files()
             return [], f"Error processing Honda image: {str(e)}"
     
+    def _quick_reject(self, file_path: str) -> bool:
+        """
+        Return True if the start of the file has none of the markers of a Honda image
+        
+        A partition table (GPT header or MBR boot signature) or any sector-aligned ext4
+        superblock in the window counts as a marker, so only files the full search could
+        not place are turned away.
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                with mmap.mmap(f.fileno(), min(os.fstat(f.fileno()).st_size, QUICK_REJECT_SIZE),
+                               access=mmap.ACCESS_READ) as mm:
+                    if mm[MBR_SIGNATURE_OFFSET:MBR_SIGNATURE_OFFSET + 2] == MBR_SIGNATURE:
+                        self._logger.debug("Quick check found an MBR boot signature")
+                        return False
+                    for marker in QUICK_REJECT_MARKERS:
+                        if mm.find(marker) != -1:
+                            self._logger.debug(f"Quick check found marker {marker!r}")
+                            return False
+                    # Same superblock test as the full ext4 scan, limited to the mapped window
+                    superblock = _find_superblock(mm, 0, 0, len(mm))
+                    if superblock is not None:
+                        self._logger.debug(f"Quick check found an ext4 superblock at offset {superblock[0]}")
+                        return False
+        except (OSError, ValueError) as e:
+            # Can't tell cheaply, let the full search decide
+            self._logger.debug(f"Quick check skipped: {e}")
+            return False
+        
+        return True
+    
     def _find_partition_by_name(self, image_path: str, partition_name: str = "userdata", stop_event=None) -> Optional[Tuple[int, int]]:
-        """Find partition offset and size by scanning for GPT or ext4 patterns"""
+        """
+        Find partition offset and size by scanning for GPT or ext4 patterns
+        
+        When a readable GPT does not name the partition, the ext4 signature scan is
+        limited to the head of each partition it lists.
+        """
         self._logger.info(f"Searching for '{partition_name}' partition in image")
         
         try:
             with open(image_path, 'rb') as f:
-                # Check for stop signal
-                if stop_event and stop_event.is_set():
-                    self._logger.debug("Partition search stopped by user")
-                    return None
-                
-                # Try to find GPT header first
-                self._logger.debug("Attempting to find GPT partition")
-                gpt_result = self._find_gpt_partition(f, partition_name, stop_event)
-                if gpt_result[0] is not None:
-                    self._logger.info(f"Found partition via GPT at offset {gpt_result[0]}")
-                    return gpt_result
-                
-                # Check for stop signal
-                if stop_event and stop_event.is_set():
-                    self._logger.debug("Partition search stopped by user")
-                    return None
+                # Map the image once, the GPT lookup and the sequential ext4 fallback read
+                # straight from the page cache instead of through seek/read copies
+                try:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (ValueError, OSError, OverflowError) as e:
+                    self._logger.debug(f"mmap unavailable ({e}), using buffered reads")
+                    mm = None
                 
-                # Try to find ext4 signature directly
-                self._logger.debug("GPT search failed, attempting direct ext4 search")
-                ext4_result = self._find_ext4_partition(f, stop_event)
-                if ext4_result[0] is not None:
-                    self._logger.info(f"Found partition via ext4 signature at offset {ext4_result[0]}")
-                    return ext4_result
+                try:
+                    # Check for stop signal
+                    if stop_event and stop_event.is_set():
+                        self._logger.debug("Partition search stopped by user")
+                        return None
+                    
+                    # Try to find GPT header first
+                    self._logger.debug("Attempting to find GPT partition")
+                    gpt_partitions = self._list_gpt_partitions(mm if mm is not None else f, stop_event)
+                    candidate_ranges = None
+                    if gpt_partitions:
+                        target = partition_name.lower()
+                        for start_lba, end_lba, name in gpt_partitions:
+                            if name and target in name.lower():
+                                offset = start_lba * 512
+                                size = (end_lba - start_lba + 1) * 512
+                                self._logger.info(f"Found '{name}' partition: offset={offset}, size={size/1024/1024:.2f}MB")
+                                self._logger.info(f"Found partition via GPT at offset {offset}")
+                                return offset, size
+                        
+                        self._logger.debug(f"Partition '{partition_name}' not found in GPT, scanning listed partitions")
+                        # Filesystems start at partition boundaries, so only the enumerated
+                        # partitions need scanning rather than the whole image
+                        candidate_ranges = [(start_lba * 512, (end_lba + 1) * 512)
+                                            for start_lba, end_lba, _ in gpt_partitions]
+                    
+                    # Check for stop signal
+                    if stop_event and stop_event.is_set():
+                        self._logger.debug("Partition search stopped by user")
+                        return None
+                    
+                    # Try to find ext4 signature directly
+                    self._logger.debug("GPT search failed, attempting direct ext4 search")
+                    ext4_result = self._find_ext4_partition(f, stop_event, candidate_ranges, mm)
+                    if ext4_result[0] is not None:
+                        self._logger.info(f"Found partition via ext4 signature at offset {ext4_result[0]}")
+                        return ext4_result
+                finally:
+                    if mm is not None:
+                        mm.close()
             
             self._logger.warning("No partition found using any method")
             return None
@@ -243,14 +478,23 @@ class HondaDecoder(BaseDecoder):
             self._logger.error(f"Error during partition search: {e}", exc_info=True)
             return None
     
-    def _find_gpt_partition(self, f: BinaryIO, partition_name: str, stop_event=None) -> Tuple[Optional[int], Optional[int]]:
-        """Find partition using GPT (GUID Partition Table)"""
+    def _list_gpt_partitions(self, f: BinaryIO, stop_event=None) -> Optional[List[Tuple[int, int, str]]]:
+        """
+        Enumerate named partitions from the GPT (GUID Partition Table)
+        
+        Args:
+            f: Open image file, or a read-only mmap of it (both support seek/read)
+            stop_event: Optional event to abort the search
+        
+        Returns:
+            List of (start LBA, end LBA, name) tuples, or None if no usable GPT was found
+        """
         self._logger.debug("Starting GPT partition search")
         
         try:
             # Check for stop signal
             if stop_event and stop_event.is_set():
-                return None, None
+                return None
             
             # GPT header is at LBA 1 (sector size 512)
             f.seek(512)
@@ -258,65 +502,79 @@ class HondaDecoder(BaseDecoder):
             
             if len(gpt_header) < 92 or gpt_header[:8] != b'EFI PART':
                 self._logger.debug("No valid GPT header found at expected location")
-                return None, None
+                return None
             
             self._logger.debug("Found valid GPT header")
             
             # Parse GPT header
-            partition_entries_lba, = struct.unpack('<Q', gpt_header[72:80])
-            num_partitions, = struct.unpack('<I', gpt_header[80:84])
-            partition_entry_size, = struct.unpack('<I', gpt_header[84:88])
+            partition_entries_lba, num_partitions, partition_entry_size = _GPT_HDR.unpack_from(gpt_header, 72)
             
             self._logger.debug(f"GPT: {num_partitions} partitions, entry size: {partition_entry_size}, "
                              f"entries start at LBA {partition_entries_lba}")
             
-            # Read partition entries
+            if partition_entry_size < _GPT_ENT.size:
+                self._logger.warning(f"Unsupported GPT partition entry size: {partition_entry_size}")
+                return None
+            
+            partitions = []
+            debug = self._logger.isEnabledFor(logging.DEBUG)
+            
+            # Read all partition entries in a single call
             f.seek(partition_entries_lba * 512)
+            expected = min(num_partitions, 128)  # Reasonable limit
+            entries_data = f.read(expected * partition_entry_size)
+            count = min(len(entries_data) // partition_entry_size, expected)
+            if count < expected:
+                self._logger.warning(f"Incomplete partition entry at index {count}")
+            
+            # Standard 128-byte entries unpack as one contiguous run, larger ones entry by entry
+            if partition_entry_size == _GPT_ENT.size:
+                parsed = _GPT_ENT.iter_unpack(entries_data[:count * _GPT_ENT.size])
+            else:
+                parsed = (_GPT_ENT.unpack_from(entries_data, i * partition_entry_size) for i in range(count))
             
-            for i in range(min(num_partitions, 128)):  # Reasonable limit
+            for i, (type_guid, _, start_lba, end_lba, _, name_bytes) in enumerate(parsed):
                 # Check for stop signal periodically
                 if stop_event and stop_event.is_set():
                     self._logger.debug("GPT search stopped by user")
-                    return None, None
-                
-                entry = f.read(partition_entry_size)
-                if len(entry) < 128:
-                    self._logger.warning(f"Incomplete partition entry at index {i}")
-                    break
+                    return None
                 
                 # Check if partition exists (non-zero GUID)
-                if entry[:16] == b'\x00' * 16:
+                if type_guid == _ZERO16:
                     continue
                 
-                # Extract partition name (UTF-16LE, 72 bytes max)
-                name_bytes = entry[56:128]
-                try:
-                    name = name_bytes.decode('utf-16le').rstrip('\x00')
-                    self._logger.debug(f"Partition {i}: '{name}'")
-                except:
-                    self._logger.debug(f"Failed to decode partition {i} name")
+                # Extract partition name (UTF-16LE, 72 bytes max), unnamed slots are kept
+                # as scan candidates but skip the decode
+                if name_bytes[0] == 0 and name_bytes[1] == 0:
+                    partitions.append((start_lba, end_lba, ''))
                     continue
                 
-                if partition_name.lower() in name.lower():
-                    start_lba, = struct.unpack('<Q', entry[32:40])
-                    end_lba, = struct.unpack('<Q', entry[40:48])
-                    
-                    offset = start_lba * 512
-                    size = (end_lba - start_lba + 1) * 512
-                    
-                    self._logger.info(f"Found '{name}' partition: offset={offset}, size={size/1024/1024:.2f}MB")
-                    return offset, size
+                name = name_bytes.decode('utf-16le', errors='ignore').rstrip('\x00')
+                if debug:
+                    self._logger.debug(f"Partition {i}: '{name}'")
+                partitions.append((start_lba, end_lba, name))
             
-            self._logger.debug(f"Partition '{partition_name}' not found in GPT")
+            return partitions
             
         except Exception as e:
             self._logger.error(f"Error parsing GPT: {e}")
             pass
         
-        return None, None
+        return None
     
-    def _find_ext4_partition(self, f: BinaryIO, stop_event=None) -> Tuple[Optional[int], Optional[int]]:
-        """Find ext4 partition by scanning for superblock signature"""
+    def _find_ext4_partition(self, f: BinaryIO, stop_event=None,
+                             ranges: Optional[List[Tuple[int, int]]] = None,
+                             mm: Optional[mmap.mmap] = None) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Find ext4 partition by scanning for superblock signature
+        
+        Args:
+            f: Open image file
+            stop_event: Optional event to abort the scan
+            ranges: Optional (start, end) byte ranges of known partitions; when given only
+                the head of each range is scanned instead of the start of the image
+            mm: Optional read-only mapping of the image, searched instead of reading from f
+        """
         self._logger.debug("Starting ext4 partition search")
         
         try:
@@ -328,49 +586,41 @@ class HondaDecoder(BaseDecoder):
             
             self._logger.debug(f"File size: {file_size/1024/1024:.2f} MB")
             
-            # ext4 superblock is at offset 1024 from partition start
-            chunk_size = 4 * 1024 * 1024  # 4MB chunks
-            max_search = min(file_size, 500 * 1024 * 1024)  # Search first 500MB
-            
-            self._logger.debug(f"Searching first {max_search/1024/1024:.0f} MB in {chunk_size/1024/1024:.0f} MB chunks")
+            if ranges is not None:
+                windows = sorted((start, min(start + EXT4_SCAN_WINDOW, end, file_size))
+                                 for start, end in ranges if start < file_size)
+                if not windows:
+                    self._logger.debug("No partition ranges inside the image to search")
+                    return None, None
+                self._logger.debug(f"Searching {len(windows)} GPT partition ranges")
+            else:
+                max_search = min(file_size, EXT4_MAX_SEARCH)
+                windows = [(start, min(start + EXT4_SCAN_WINDOW, max_search))
+                           for start in range(0, max_search, EXT4_SCAN_WINDOW)]
+                
+                self._logger.debug(f"Searching first {max_search/1024/1024:.0f} MB in {len(windows)} windows")
             
-            for offset in range(0, max_search, chunk_size):
-                # Check for stop signal
+            # Windows are scanned in order, so the first hit is also the lowest offset
+            result = None
+            for start, end in windows:
                 if stop_event and stop_event.is_set():
                     self._logger.debug("ext4 search stopped by user")
                     return None, None
-                
-                if offset % (50 * 1024 * 1024) == 0:  # Log every 50MB
-                    self._logger.debug(f"Searching at offset {offset/1024/1024:.0f} MB")
-                
-                f.seek(offset)
-                chunk = f.read(min(chunk_size, max_search - offset))
-                
-                # Look for ext4 magic number (0xEF53) at offset 1024 + 56
-                for i in range(len(chunk) - 1080):
-                    if chunk[i + 1024 + 56:i + 1024 + 58] == b'\x53\xEF':
-                        partition_offset = offset + i
-                        self._logger.debug(f"Found ext4 magic at offset {partition_offset}")
-                        
-                        # Validate this is a real ext4 superblock
-                        f.seek(partition_offset + 1024)
-                        superblock = f.read(1024)
-                        
-                        if len(superblock) >= 1024:
-                            # Get block count and block size
-                            block_count, = struct.unpack('<I', superblock[4:8])
-                            log_block_size, = struct.unpack('<I', superblock[24:28])
-                            block_size = 1024 << log_block_size
-                            
-                            # Sanity check
-                            if block_size in [1024, 2048, 4096] and block_count > 1000:
-                                partition_size = block_count * block_size
-                                self._logger.info(f"Valid ext4 filesystem found: {block_count} blocks of "
-                                                f"{block_size} bytes = {partition_size/1024/1024:.2f} MB")
-                                return partition_offset, partition_size
-                            else:
-                                self._logger.debug(f"Invalid ext4 parameters: block_size={block_size}, "
-                                                 f"block_count={block_count}")
+                if mm is not None:
+                    result = _find_superblock(mm, 0, start, end)
+                else:
+                    # No mapping of the image, read the window plus room for a superblock at its end
+                    f.seek(start)
+                    result = _find_superblock(f.read(end - start + 2048), start, start, end)
+                if result:
+                    self._logger.debug(f"Found ext4 magic in window {start/1024/1024:.0f}-{end/1024/1024:.0f} MB")
+                    break
+            
+            if result:
+                partition_offset, partition_size = result
+                self._logger.info(f"Valid ext4 filesystem found at offset {partition_offset}: "
+                                f"{partition_size/1024/1024:.2f} MB")
+                return partition_offset, partition_size
             
             self._logger.debug("No ext4 partition found")
             
@@ -390,58 +640,24 @@ class HondaDecoder(BaseDecoder):
                 self._logger.debug("Database extraction stopped by user")
                 return None
             
-            # Create temporary file for partition
-            temp_partition = tempfile.NamedTemporaryFile(delete=False, suffix='.img')
-            self.temp_files.append(temp_partition.name)
-            self._logger.debug(f"Created temporary partition file: {temp_partition.name}")
-            
-            if progress_callback:
-                progress_callback("Extracting userdata partition...", 25)
-                self._log_progress("Extracting userdata partition", 25)
-            
-            # Extract partition to temporary file with stop checking
-            with open(image_path, 'rb') as src:
-                src.seek(offset)
-                remaining = size
-                chunk_size = 8 * 1024 * 1024  # 8MB chunks
-                bytes_extracted = 0
-                
-                self._logger.debug(f"Extracting {size/1024/1024:.2f} MB in {chunk_size/1024/1024:.0f} MB chunks")
-                
-                while remaining > 0:
-                    # Check for stop signal during extraction
-                    if stop_event and stop_event.is_set():
-                        self._logger.warning("Partition extraction stopped by user")
-                        temp_partition.close()
-                        return None
-                    
-                    read_size = min(chunk_size, remaining)
-                    chunk = src.read(read_size)
-                    if not chunk:
-                        break
-                    temp_partition.write(chunk)
-                    remaining -= len(chunk)
-                    bytes_extracted += len(chunk)
-                    
-                    if bytes_extracted % (100 * 1024 * 1024) == 0:  # Log every 100MB
-                        self._logger.debug(f"Extracted {bytes_extracted/1024/1024:.0f} MB / {size/1024/1024:.0f} MB")
-            
-            temp_partition.close()
-            self._logger.info(f"Successfully extracted {bytes_extracted/1024/1024:.2f} MB to temporary file")
-            
-            # Check for stop signal
-            if stop_event and stop_event.is_set():
-                self._logger.debug("Database extraction stopped by user after partition extract")
-                return None
-            
             if progress_callback:
                 progress_callback("Opening partition with TSK...", 35)
                 self._log_progress("Opening partition with TSK", 35)
             
-            # Open with TSK
-            self._logger.debug("Opening partition with pytsk3")
-            img = pytsk3.Img_Info(temp_partition.name)
-            fs = pytsk3.FS_Info(img)
+            # Open the filesystem in place inside the image instead of copying the partition out
+            # The partition size is only needed if we have to fall back to copying it out
+            self._logger.debug(f"Opening partition with pytsk3 at image offset {offset} "
+                             f"({size/1024/1024:.2f} MB, no copy)")
+            try:
+                img = pytsk3.Img_Info(image_path)
+                fs = pytsk3.FS_Info(img, offset=offset)
+            except (IOError, TypeError) as e:
+                self._logger.warning(f"Could not open filesystem in place ({e}), extracting partition to temporary file")
+                partition_path = self._extract_partition_to_temp(image_path, offset, size, progress_callback, stop_event)
+                if not partition_path:
+                    return None
+                img = pytsk3.Img_Info(partition_path)
+                fs = pytsk3.FS_Info(img)
             
             self._logger.info(f"Filesystem opened successfully - Type: {fs.info.ftype}")
             
@@ -459,171 +675,252 @@ class HondaDecoder(BaseDecoder):
             self._logger.error(f"Error extracting CRM database: {e}", exc_info=True)
             return None
     
-    def _try_extract_crm_paths(self, fs, progress_callback=None, stop_event=None) -> Optional[str]:
-        """Try extracting CRM database from multiple possible paths"""
-        self._logger.info("Searching for CRM database in filesystem")
-        
-        # Common paths where Honda CRM database might be located
-        search_paths = [
-            "/data/com.honda.telematics.core/databases/crm.db",
-            "/data/data/com.honda.telematics.core/databases/crm.db", 
-            "data/com.honda.telematics.core/databases/crm.db",
-            "data/data/com.honda.telematics.core/databases/crm.db",
-            "/userdata/data/com.honda.telematics.core/databases/crm.db",
-            "userdata/data/com.honda.telematics.core/databases/crm.db",
-        ]
+    def _extract_partition_to_temp(self, image_path: str, offset: int, size: int, progress_callback=None, stop_event=None) -> Optional[str]:
+        """Copy the partition out of the image to a temporary file (fallback when TSK cannot open it in place)"""
+        # Create temporary file for partition
+        temp_partition = self._create_temp_file('.img')
+        self.temp_files.append(temp_partition.name)
+        self._logger.debug(f"Created temporary partition file: {temp_partition.name}")
         
-        self._logger.debug(f"Trying {len(search_paths)} known paths")
+        if progress_callback:
+            progress_callback("Extracting userdata partition...", 25)
+            self._log_progress("Extracting userdata partition", 25)
         
-        for i, search_path in enumerate(search_paths):
-            # Check for stop signal
-            if stop_event and stop_event.is_set():
-                self._logger.debug("Path search stopped by user")
-                return None
+        # Extract partition to temporary file with stop checking
+        with open(image_path, 'rb') as src:
+            bytes_extracted = None
             
-            try:
-                if progress_callback:
-                    progress_callback(f"Trying path {i+1}/{len(search_paths)}: {search_path}", 40 + i * 2)
-                
-                self._logger.debug(f"Trying path: {search_path}")
-                
-                file_obj = fs.open(search_path)
-                
-                # Create temporary file for database
-                temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-                self.temp_files.append(temp_db.name)
-                
-                # Read and write the file
-                file_size = file_obj.info.meta.size
-                self._logger.info(f"Found crm.db at {search_path} (size: {file_size} bytes)")
-                
-                data = file_obj.read_random(0, file_size)
-                temp_db.write(data)
-                temp_db.close()
+            if hasattr(os, 'sendfile'):
+                try:
+                    bytes_extracted = self._sendfile_partition(src, temp_partition, offset, size, stop_event)
+                except OSError as e:
+                    self._logger.debug(f"sendfile not usable for this copy ({e}), using buffered copy")
+                    temp_partition.seek(0)
+                    temp_partition.truncate()
+                    bytes_extracted = None
+            
+            if bytes_extracted is None:
+                src.seek(offset)
+                remaining = size
+                # Reuse one 8MB buffer for every chunk instead of allocating a bytes object per read
+                buffer = memoryview(bytearray(PARTITION_COPY_CHUNK))
+                bytes_extracted = 0
                 
-                self._logger.info(f"Successfully extracted database to: {temp_db.name}")
-                return temp_db.name
+                self._logger.debug(f"Extracting {size/1024/1024:.2f} MB in {PARTITION_COPY_CHUNK/1024/1024:.0f} MB chunks")
                 
-            except Exception as e:
-                self._logger.debug(f"Path {search_path} not found: {e}")
-                continue
+                stop_requested = stop_event.is_set if stop_event else None
+                log_progress = self._logger.isEnabledFor(logging.DEBUG)
+                while remaining > 0:
+                    # Check for stop signal every STOP_CHECK_BYTES rather than every chunk
+                    if stop_requested and bytes_extracted % STOP_CHECK_BYTES == 0 and stop_requested():
+                        break
+                    
+                    read = src.readinto(buffer[:min(PARTITION_COPY_CHUNK, remaining)])
+                    if not read:
+                        break
+                    temp_partition.write(buffer[:read])
+                    remaining -= read
+                    bytes_extracted += read
+                    
+                    if log_progress and not bytes_extracted & COPY_LOG_MASK:
+                        self._logger.debug(f"Extracted {bytes_extracted/1024/1024:.0f} MB / {size/1024/1024:.0f} MB")
         
-        # Check for stop signal before recursive search
         if stop_event and stop_event.is_set():
-            self._logger.debug("Path search stopped by user before recursive search")
+            self._logger.warning("Partition extraction stopped by user")
+            temp_partition.close()
             return None
         
-        # If direct paths fail, try recursive search
-        self._logger.info("Direct paths failed, starting recursive search for crm.db")
+        temp_partition.close()
+        self._logger.info(f"Successfully extracted {bytes_extracted/1024/1024:.2f} MB to temporary file")
+        
+        return temp_partition.name
+    
+    def _sendfile_partition(self, src: BinaryIO, dst: BinaryIO, offset: int, size: int, stop_event=None) -> int:
+        """Copy a partition between files inside the kernel with os.sendfile"""
+        self._logger.debug(f"Extracting {size/1024/1024:.2f} MB with sendfile")
+        
+        # Reserve the space up front to avoid fragmentation and extend-on-write stalls
+        if hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(dst.fileno(), 0, size)
+            except OSError as e:
+                self._logger.debug(f"posix_fallocate failed: {e}")
+        
+        copied = 0
+        while copied < size:
+            # Check for stop signal between kernel copies
+            if stop_event and stop_event.is_set():
+                break
+            
+            sent = os.sendfile(dst.fileno(), src.fileno(), offset + copied, min(size - copied, SENDFILE_CHUNK))
+            if sent == 0:
+                break
+            copied += sent
+            self._logger.debug(f"Extracted {copied/1024/1024:.0f} MB / {size/1024/1024:.0f} MB")
+        
+        # Drop any preallocated tail if the image ended early
+        dst.truncate(copied)
+        return copied
+    
+    def _try_extract_crm_paths(self, fs, progress_callback=None, stop_event=None) -> Optional[str]:
+        """Find and extract the CRM database with a single walk of the filesystem"""
+        self._logger.info("Searching for CRM database in filesystem")
+        
+        # The known Honda locations all live under /data or /userdata, which the walk
+        # visits first, so probing them up front would only repeat those lookups
         if progress_callback:
-            progress_callback("Starting recursive search for crm.db...", 50)
-            self._log_progress("Starting recursive search for crm.db", 50)
+            progress_callback("Searching filesystem for crm.db...", 50)
+            self._log_progress("Searching filesystem for crm.db", 50)
         
         return self._recursive_search_crm(fs, stop_event)
     
+    def _dump_tsk_file(self, file_obj, out_file: BinaryIO, stop_event=None) -> Optional[int]:
+        """Copy a pytsk3 file to an open output file in fixed-size chunks, None if stopped"""
+        size = file_obj.info.meta.size
+        offset = 0
+        while offset < size:
+            # Each chunk is a natural point to honour a stop request
+            if stop_event and stop_event.is_set():
+                self._logger.debug(f"File copy stopped by user at {offset} of {size} bytes")
+                return None
+            data = file_obj.read_random(offset, min(TSK_READ_CHUNK, size - offset))
+            if not data:
+                self._logger.warning(f"Short read at offset {offset} of {size} bytes")
+                break
+            out_file.write(data)
+            offset += len(data)
+        return offset
+    
     def _recursive_search_crm(self, fs, stop_event=None) -> Optional[str]:
-        """Recursively search for crm.db files"""
+        """Search for crm.db, walking the likeliest top-level directories first"""
         self._logger.info("Starting recursive search for crm.db")
         
         try:
-            if self._search_directory(fs, fs.open_dir("/"), "/", 0, stop_event):
-                # Return the last created temp file (should be crm.db)
-                for temp_file in reversed(self.temp_files):
-                    if temp_file.endswith('.db'):
-                        self._logger.info(f"Found crm.db via recursive search: {temp_file}")
-                        return temp_file
-            
-            self._logger.warning("Recursive search completed without finding crm.db")
-            return None
+            # Walk the root itself, collecting its keyword subdirectories
+            root_dirs = []
+            visited = set()
+            result = self._walk_for_crm(fs, "/", 0, stop_event, visited, root_dirs)
+            
+            # Take the directories the database normally lives under first, the rest keep directory order
+            root_dirs.sort(key=lambda path: CRM_SEARCH_FIRST.get(path.lower(), len(CRM_SEARCH_FIRST)))
+            
+            for path in root_dirs:
+                if result or (stop_event and stop_event.is_set()):
+                    break
+                result = self._walk_for_crm(fs, path, 1, stop_event, visited)
+            
+            if stop_event and stop_event.is_set():
+                self._logger.debug("Directory search stopped by user")
+                return None
+            
+            if not result:
+                self._logger.warning("Recursive search completed without finding crm.db")
+            return result
             
         except Exception as e:
             self._logger.error(f"Error during recursive search: {e}")
             return None
     
-    def _search_directory(self, fs, directory, current_path: str, depth: int, stop_event=None) -> bool:
-        """Search directory recursively with depth limit and stop checking"""
-        if depth > 10:  # Prevent infinite recursion
-            self._logger.debug(f"Max recursion depth reached at: {current_path}")
-            return False
+    def _walk_for_crm(self, fs, start_path: str, start_depth: int, stop_event, visited: set,
+                      collect_dirs: Optional[List[str]] = None) -> Optional[str]:
+        """
+        Depth-first search for crm.db below start_path using an explicit stack of directory iterators.
         
-        # Check for stop signal
-        if stop_event and stop_event.is_set():
-            return False
+        Directory addresses already searched are shared through visited. When collect_dirs is
+        given, keyword subdirectories of start_path are appended to it instead of being descended into.
+        """
+        # Each frame holds a live directory iterator so siblings are resumed after a
+        # subdirectory is exhausted, same visiting order as a recursive walk
+        try:
+            stack = deque([(iter(fs.open_dir(start_path)), start_path, start_depth)])
+        except Exception as e:
+            self._logger.debug(f"Cannot open directory {start_path}: {e}")
+            return None
+        entry_count = 0
+        # Bind per-entry lookups once for the walk
+        reg_type = pytsk3.TSK_FS_META_TYPE_REG
+        dir_type = pytsk3.TSK_FS_META_TYPE_DIR
+        keyword_search = CRM_SEARCH_KEYWORDS_RE.search
+        debug = self._logger.isEnabledFor(logging.DEBUG)
         
-        if depth == 0:
-            self._logger.debug(f"Searching root directory")
-        else:
-            self._logger.debug(f"Searching directory: {current_path} (depth: {depth})")
+        while stack:
+            # Periodically check for stop signal
+            if entry_count % STOP_CHECK_ENTRIES == 0 and stop_event and stop_event.is_set():
+                self._logger.debug(f"Directory search of {start_path} stopped")
+                return None
             
-        try:
-            entry_count = 0
-            for entry in directory:
-                entry_count += 1
-                
-                # Check for stop signal during directory iteration
-                if stop_event and stop_event.is_set():
-                    self._logger.debug("Directory search stopped by user")
-                    return False
+            entries, current_path, depth = stack[-1]
+            try:
+                entry = next(entries, None)
+            except Exception as e:
+                self._logger.debug(f"Error reading directory {current_path}: {e}")
+                entry = None
+            if entry is None:
+                stack.pop()
+                continue
+            entry_count += 1
+            
+            # Match on the raw name bytes, decoding only once a path is needed
+            try:
+                name_bytes = entry.info.name.name
+            except AttributeError:
+                continue
+            
+            # Skip '.', '..' and hidden entries up front, none of them lead to crm.db
+            if name_bytes.startswith(b'.') or not entry.info.meta:
+                continue
+            
+            name_lower = name_bytes.lower()
+            meta = entry.info.meta
+            meta_type = meta.type
+            
+            # Check if it's a regular file named crm.db
+            if meta_type == reg_type and name_lower in CRM_DB_NAMES:
+                full_path = f"{current_path.rstrip('/')}/{name_bytes.decode('utf-8', errors='ignore')}"
+                self._logger.info(f"Found crm.db at: {full_path}")
                 
                 try:
-                    entry_name = entry.info.name.name.decode('utf-8', errors='ignore')
-                except:
-                    continue
-                
-                if entry_name in ['.', '..']:
-                    continue
-                
-                full_path = f"{current_path}{entry_name}" if current_path.endswith('/') else f"{current_path}/{entry_name}"
-                
-                # Check if it's a regular file named crm.db
-                if (entry.info.meta and 
-                    entry.info.meta.type == pytsk3.TSK_FS_META_TYPE_REG and 
-                    entry_name.lower() == "crm.db"):
+                    file_obj = fs.open(full_path)
                     
-                    self._logger.info(f"Found crm.db at: {full_path}")
+                    # Create temporary file for database
+                    temp_db = self._create_temp_file('.db')
+                    self.temp_files.append(temp_db.name)
                     
-                    try:
-                        file_obj = fs.open(full_path)
-                        
-                        # Create temporary file for database
-                        temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-                        self.temp_files.append(temp_db.name)
-                        
-                        # Read file data and write to temp file
-                        file_size = file_obj.info.meta.size
-                        self._logger.debug(f"Extracting crm.db (size: {file_size} bytes)")
-                        
-                        data = file_obj.read_random(0, file_size)
-                        temp_db.write(data)
-                        temp_db.close()
-                        
-                        self._logger.info(f"Successfully extracted crm.db to: {temp_db.name}")
-                        return True
-                        
-                    except Exception as e:
-                        self._logger.error(f"Failed to extract {full_path}: {e}")
-                        pass
-                
-                # Recurse into directories that might contain Honda data
-                elif (entry.info.meta and 
-                      entry.info.meta.type == pytsk3.TSK_FS_META_TYPE_DIR and
-                      any(keyword in entry_name.lower() for keyword in ['honda', 'telematics', 'data', 'app'])):
+                    # Copy file data to the temp file in bounded chunks
+                    self._logger.debug(f"Extracting crm.db (size: {file_obj.info.meta.size} bytes)")
+                    
+                    with temp_db:
+                        copied = self._dump_tsk_file(file_obj, temp_db, stop_event)
+                    if copied is None:
+                        return None
+                    
+                    self._logger.info(f"Found crm.db via recursive search: {temp_db.name}")
+                    return temp_db.name
                     
-                    try:
-                        sub_dir = fs.open_dir(full_path)
-                        if self._search_directory(fs, sub_dir, full_path, depth + 1, stop_event):
-                            return True
-                    except Exception as e:
+                except Exception as e:
+                    self._logger.error(f"Failed to extract {full_path}: {e}")
+            
+            # Descend into directories that might contain Honda data
+            elif (meta_type == dir_type and
+                  depth < CRM_SEARCH_MAX_DEPTH and
+                  meta.addr not in visited and
+                  keyword_search(name_lower)):
+                
+                visited.add(meta.addr)
+                full_path = f"{current_path.rstrip('/')}/{name_bytes.decode('utf-8', errors='ignore')}"
+                if collect_dirs is not None and depth == start_depth:
+                    collect_dirs.append(full_path)
+                    continue
+                try:
+                    stack.append((iter(fs.open_dir(full_path)), full_path, depth + 1))
+                    if debug:
+                        self._logger.debug(f"Searching directory: {full_path} (depth: {depth + 1})")
+                except Exception as e:
+                    if debug:
                         self._logger.debug(f"Cannot open directory {full_path}: {e}")
-                        continue
-            
-            self._logger.debug(f"Searched {entry_count} entries in {current_path}")
-        
-        except Exception as e:
-            self._logger.error(f"Error searching directory {current_path}: {e}")
-            pass
         
-        return False
+        self._logger.debug(f"Searched {entry_count} entries below {start_path}")
+        return None
     
     def _process_crm_database(self, crm_db_path: str, progress_callback=None, stop_event=None) -> List[GPSEntry]:
         """Process the eco_logs table and convert to GPSEntry objects"""
@@ -636,155 +933,203 @@ class HondaDecoder(BaseDecoder):
                 self._logger.debug("Database processing stopped by user")
                 return entries
             
-            # Connect to the SQLite database
-            self._logger.debug("Connecting to SQLite database")
-            conn = sqlite3.connect(crm_db_path)
-            cursor = conn.cursor()
-            
-            # Check if eco_logs table exists
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='eco_logs';")
-            result = cursor.fetchone()
-            
-            if not result:
-                self._logger.warning("eco_logs table not found in database")
-                conn.close()
-                return entries
-            
-            self._logger.info("Found eco_logs table")
-            
-            if progress_callback:
-                progress_callback("Reading eco_logs table...", 70)
-                self._log_progress("Reading eco_logs table", 70)
-            
-            # Check for stop signal
-            if stop_event and stop_event.is_set():
-                conn.close()
-                return entries
-            
-            # Check available columns
-            cursor.execute("PRAGMA table_info(eco_logs);")
-            columns_info = cursor.fetchall()
-            columns = [row[1] for row in columns_info]
-            
-            self._logger.debug(f"eco_logs columns: {columns}")
-            
-            required_columns = [
-                'start_pos_time', 'start_pos_lat', 'start_pos_lon',
-                'finish_pos_time', 'finish_pos_lat', 'finish_pos_lon'
-            ]
-            
-            # Check which columns are available
-            available_required = [col for col in required_columns if col in columns]
-            
-            if not available_required:
-                self._logger.error("No required columns found in eco_logs table")
-                conn.close()
-                return entries
-            
-            self._logger.info(f"Available required columns: {available_required}")
-            
-            # Query the available columns
-            columns_str = ', '.join(available_required)
-            query = f"SELECT {columns_str} FROM eco_logs WHERE start_pos_lat IS NOT NULL AND start_pos_lon IS NOT NULL"
-            
-            self._logger.debug(f"Executing query: {query}")
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            
-            self._logger.info(f"Retrieved {len(rows)} records from eco_logs")
-            
-            if progress_callback:
-                progress_callback(f"Processing {len(rows)} records...", 80)
-                self._log_progress(f"Processing {len(rows)} records", 80)
-            
-            # Convert rows to GPSEntry objects
-            valid_entries = 0
-            invalid_entries = 0
-            
-            for i, row_data in enumerate(rows):
-                # Check for stop signal during processing
+            # Connect to the extracted SQLite database read-only; immutable=1 skips
+            # locking and journal recovery since nothing else touches the temp copy
+            self._logger.debug("Connecting to SQLite database (read-only)")
+            conn = sqlite3.connect(f"{Path(crm_db_path).resolve().as_uri()}?mode=ro&immutable=1",
+                                   uri=True, isolation_level=None)
+            try:
+                conn.executescript(
+                    "PRAGMA journal_mode=OFF;"
+                    "PRAGMA synchronous=OFF;"
+                    "PRAGMA temp_store=MEMORY;"
+                    "PRAGMA mmap_size=268435456;"
+                    "PRAGMA cache_size=-65536;"
+                    "PRAGMA query_only=1;"
+                )
+                cursor = conn.cursor()
+                
+                # Check if eco_logs table exists
+                cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='eco_logs';")
+                result = cursor.fetchone()
+                
+                if not result:
+                    self._logger.warning("eco_logs table not found in database")
+                    return entries
+                
+                self._logger.info("Found eco_logs table")
+                
+                if progress_callback:
+                    progress_callback("Reading eco_logs table...", 70)
+                    self._log_progress("Reading eco_logs table", 70)
+                
+                # Check for stop signal
                 if stop_event and stop_event.is_set():
-                    self._logger.warning(f"Database processing stopped by user at record {i}/{len(rows)}")
-                    conn.close()
-                    return entries  # Return partial results
-                
-                row_dict = dict(zip(available_required, row_data))
-                
-                # Extract coordinates and timestamps
-                start_lat = self._safe_float(row_dict.get('start_pos_lat'))
-                start_lon = self._safe_float(row_dict.get('start_pos_lon'))
-                finish_lat = self._safe_float(row_dict.get('finish_pos_lat'))
-                finish_lon = self._safe_float(row_dict.get('finish_pos_lon'))
-                
-                start_time = self._format_timestamp(row_dict.get('start_pos_time'))
-                finish_time = self._format_timestamp(row_dict.get('finish_pos_time'))
-                
-                if i % 100 == 0:  # Log every 100 records
-                    self._logger.debug(f"Processing record {i}: start=({start_lat}, {start_lon}), "
-                                     f"finish=({finish_lat}, {finish_lon})")
-                
-                # Prepare extra data
-                extra_data = {
-                    'start_pos_time': start_time,
-                    'start_pos_lat': start_lat or '',
-                    'start_pos_lon': start_lon or '',
-                    'finish_pos_time': finish_time,
-                    'finish_pos_lat': finish_lat or '',
-                    'finish_pos_lon': finish_lon or '',
+                    return entries
+                
+                # Check available columns
+                cursor.execute("PRAGMA table_info(eco_logs);")
+                columns_info = cursor.fetchall()
+                columns = [row[1] for row in columns_info]
+                
+                self._logger.debug(f"eco_logs columns: {columns}")
+                
+                required_columns = [
+                    'start_pos_time', 'start_pos_lat', 'start_pos_lon',
+                    'finish_pos_time', 'finish_pos_lat', 'finish_pos_lon'
+                ]
+                
+                # Check which columns are available
+                available_required = [col for col in required_columns if col in columns]
+                
+                if not available_required:
+                    self._logger.error("No required columns found in eco_logs table")
+                    return entries
+                
+                self._logger.info(f"Available required columns: {available_required}")
+                
+                # Validate in SQL: each record comes back once, with flags saying whether it has a start
+                # position and whether its start and finish positions are valid (a finish only counts
+                # if it differs from the start)
+                has_start = "start_pos_lat IS NOT NULL AND start_pos_lon IS NOT NULL"
+                start_valid = self._valid_position_sql('start_pos_lat', 'start_pos_lon')
+                finish_valid = "0"
+                # The flags only match Python when every coordinate is NULL or a plain number;
+                # values SQLite cannot read but float() can ('4_5', blobs) are checked in Python
+                checked_in_sql = f"({self._numeric_sql('start_pos_lat')} AND {self._numeric_sql('start_pos_lon')})"
+                if 'finish_pos_lat' in available_required and 'finish_pos_lon' in available_required:
+                    # A start value that is not a number never equals the finish, as in Python
+                    finish_valid = (f"({self._valid_position_sql('finish_pos_lat', 'finish_pos_lon')} "
+                                    f"AND NOT ({self._numeric_sql('start_pos_lat')} "
+                                    f"AND {self._numeric_sql('start_pos_lon')} "
+                                    f"AND CAST(finish_pos_lat AS REAL) = CAST(start_pos_lat AS REAL) "
+                                    f"AND CAST(finish_pos_lon AS REAL) = CAST(start_pos_lon AS REAL)))")
+                    checked_in_sql = (f"({checked_in_sql} AND (finish_pos_lat IS NULL OR finish_pos_lon IS NULL "
+                                      f"OR ({self._numeric_sql('finish_pos_lat')} "
+                                      f"AND {self._numeric_sql('finish_pos_lon')})))")
+                
+                # The inner query computes the flags once and selects all six columns in a fixed
+                # order, NULL for any that are missing. The outer one hands validated positions
+                # over as REAL, only the rest need converting in Python
+                inner_columns = ', '.join(col if col in available_required else f"NULL AS {col}"
+                                          for col in required_columns)
+                column_validity = {
+                    'start_pos_lat': 'start_ok', 'start_pos_lon': 'start_ok',
+                    'finish_pos_lat': 'finish_ok', 'finish_pos_lon': 'finish_ok',
                 }
+                outer_columns = ', '.join(
+                    f"CASE WHEN {column_validity[col]} THEN CAST({col} AS REAL) ELSE {col} END"
+                    if col in column_validity else col
+                    for col in required_columns)
+                # Every record is returned, so progress and the invalid count cover the whole table
+                query = (f"SELECT has_start, checked, start_ok, finish_ok, {outer_columns} FROM "
+                         f"(SELECT {has_start} AS has_start, {checked_in_sql} AS checked, "
+                         f"{start_valid} AS start_ok, {finish_valid} AS finish_ok, {inner_columns} "
+                         f"FROM eco_logs)")
                 
-                # Create entries for start position
-                if start_lat and start_lon and self._is_valid_coordinate(start_lat, start_lon):
-                    entry = GPSEntry(
-                        latitude=start_lat,
-                        longitude=start_lon,
-                        timestamp=start_time,
-                        extra_data=extra_data.copy()
-                    )
-                    entries.append(entry)
-                    valid_entries += 1
-                else:
-                    invalid_entries += 1
+                # Plain row count for progress, SQLite answers it without evaluating any column
+                cursor.execute("SELECT COUNT(*) FROM eco_logs")
+                record_count = cursor.fetchone()[0]
                 
-                # Create entries for finish position (if different from start)
-                if (finish_lat and finish_lon and 
-                    self._is_valid_coordinate(finish_lat, finish_lon) and
-                    (finish_lat != start_lat or finish_lon != start_lon)):
-                    
-                    finish_extra_data = {
-                        'start_pos_time': start_time,
-                        'start_pos_lat': start_lat or '',
-                        'start_pos_lon': start_lon or '',
-                        'finish_pos_time': finish_time,
-                        'finish_pos_lat': finish_lat,
-                        'finish_pos_lon': finish_lon,
-                    }
+                self._logger.info(f"Found {record_count} records in eco_logs")
+                
+                if progress_callback:
+                    progress_callback(f"Processing {record_count} records...", 80)
+                    self._log_progress(f"Processing {record_count} records", 80)
+                
+                self._logger.debug(f"Executing query: {query}")
+                cursor.execute(query)
+                
+                # Convert rows to GPSEntry objects, fetching from the cursor in large batches
+                cursor.arraysize = ECO_LOGS_FETCH_SIZE
+                # Bind per-row lookups once for the loop
+                entries_append = entries.append
+                new_entry = GPSEntry
+                safe_float = self._safe_float
+                is_valid_coordinate = self._is_valid_coordinate
+                format_timestamp = self._format_timestamp
+                log_debug = self._logger.debug if self._logger.isEnabledFor(logging.DEBUG) else None
+                invalid_entries = 0
+                batch_start = 0
+                
+                for rows in iter(cursor.fetchmany, []):
+                    # Check for stop signal between batches
+                    if stop_event and stop_event.is_set():
+                        self._logger.warning(f"Database processing stopped by user at record {batch_start}/{record_count}")
+                        return entries  # Return partial results
                     
-                    entry = GPSEntry(
-                        latitude=finish_lat,
-                        longitude=finish_lon,
-                        timestamp=finish_time,
-                        extra_data=finish_extra_data
-                    )
-                    entries.append(entry)
-                    valid_entries += 1
-                
-                # Update progress periodically
-                if progress_callback and i % 10 == 0 and len(rows) > 0:
-                    progress = 80 + (10 * i // len(rows))
-                    progress_callback(f"Processing record {i+1}/{len(rows)}", progress)
+                    for i, (present, checked, start_ok, finish_ok, start_time_raw, start_lat, start_lon,
+                            finish_time_raw, finish_lat, finish_lon) in enumerate(rows, batch_start):
+                        # Update progress periodically
+                        if progress_callback and i % 10 == 0:
+                            progress = 80 + (10 * i // record_count)
+                            progress_callback(f"Processing record {i+1}/{record_count}", progress)
+                            
+                            if i % 100 == 0:
+                                self._log_progress(f"Processing records ({i+1}/{record_count})", progress)
+                        
+                        # Records without a start position are not counted, as before SQL validation
+                        if not present:
+                            continue
+                        
+                        if checked:
+                            # Fully checked in SQL and nothing valid, skip the conversions
+                            if not (start_ok or finish_ok):
+                                invalid_entries += 1
+                                continue
+                            # Valid positions arrive as REAL, convert the others
+                            if not start_ok:
+                                start_lat = safe_float(start_lat)
+                                start_lon = safe_float(start_lon)
+                            if not finish_ok:
+                                finish_lat = safe_float(finish_lat)
+                                finish_lon = safe_float(finish_lon)
+                        else:
+                            start_lat = safe_float(start_lat)
+                            start_lon = safe_float(start_lon)
+                            finish_lat = safe_float(finish_lat)
+                            finish_lon = safe_float(finish_lon)
+                            start_ok = bool(start_lat and start_lon and is_valid_coordinate(start_lat, start_lon))
+                            finish_ok = bool(finish_lat and finish_lon and
+                                             is_valid_coordinate(finish_lat, finish_lon) and
+                                             (finish_lat != start_lat or finish_lon != start_lon))
+                        
+                        start_time = format_timestamp(start_time_raw)
+                        finish_time = format_timestamp(finish_time_raw)
+                        
+                        if log_debug and i % 100 == 0:  # Log every 100 records
+                            log_debug(f"Processing record {i}: start=({start_lat}, {start_lon}), "
+                                      f"finish=({finish_lat}, {finish_lon})")
+                        
+                        # Both positions of a record carry the same details, so its entries share one
+                        # dict (valid coordinates are never 0, 'or' only blanks the invalid side)
+                        extra_data = {
+                            'start_pos_time': start_time,
+                            'start_pos_lat': start_lat or '',
+                            'start_pos_lon': start_lon or '',
+                            'finish_pos_time': finish_time,
+                            'finish_pos_lat': finish_lat or '',
+                            'finish_pos_lon': finish_lon or '',
+                        }
+                        
+                        # Create entries for the start position, then the finish position
+                        if start_ok:
+                            entries_append(new_entry(start_lat, start_lon, start_time, extra_data))
+                        else:
+                            invalid_entries += 1
+                        if finish_ok:
+                            entries_append(new_entry(finish_lat, finish_lon, finish_time, extra_data))
                     
-                    if i % 100 == 0:
-                        self._log_progress(f"Processing records ({i+1}/{len(rows)})", progress)
-            
-            conn.close()
-            
-            self._logger.info(f"Database processing complete. Valid positions: {valid_entries}, "
-                            f"Invalid positions: {invalid_entries}")
-            
-            if progress_callback:
-                progress_callback("Database processing complete!", 90)
-                self._log_progress("Database processing complete", 90)
+                    batch_start += len(rows)
+                
+                self._logger.info(f"Database processing complete. Valid positions: {len(entries)}, "
+                                f"Invalid positions: {invalid_entries}")
+                
+                if progress_callback:
+                    progress_callback("Database processing complete!", 90)
+                    self._log_progress("Database processing complete", 90)
+            finally:
+                conn.close()
             
         except Exception as e:
             self._logger.error(f"Error processing CRM database: {e}", exc_info=True)
@@ -793,15 +1138,34 @@ class HondaDecoder(BaseDecoder):
         
         return entries
     
+    @staticmethod
+    def _numeric_sql(column: str) -> str:
+        """Build a SQL predicate that holds when a column's value is a number float() reads the same way"""
+        # CAST reads any numeric prefix ('12abc' is 12), comparing the cast back against the
+        # column only holds for values float() would also accept
+        return f"CAST({column} AS REAL) = {column}"
+    
+    @classmethod
+    def _valid_position_sql(cls, lat_column: str, lon_column: str) -> str:
+        """Build a SQL predicate matching _is_valid_coordinate for a non-zero lat/lon column pair"""
+        lat = f"CAST({lat_column} AS REAL)"
+        lon = f"CAST({lon_column} AS REAL)"
+        return (f"({cls._numeric_sql(lat_column)} AND {cls._numeric_sql(lon_column)} "
+                f"AND {lat} <> 0 AND {lon} <> 0 "
+                f"AND {lat} BETWEEN -90 AND 90 AND {lon} BETWEEN -180 AND 180)")
+    
     def _safe_float(self, value) -> Optional[float]:
         """Safely convert value to float"""
+        # REAL columns already come back from SQLite as float
+        if type(value) is float:
+            return value
         if value is None:
             return None
         try:
-            result = float(value)
-            return result
+            return float(value)
         except (ValueError, TypeError) as e:
-            self._logger.debug(f"Failed to convert '{value}' to float: {e}")
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug(f"Failed to convert '{value}' to float: {e}")
             return None
     
     def _is_valid_coordinate(self, lat: float, lon: float) -> bool:
@@ -823,55 +1187,30 @@ class HondaDecoder(BaseDecoder):
         if not timestamp:
             return ''
         
-        self._logger.debug(f"Formatting timestamp: {timestamp} (type: {type(timestamp)})")
+        # Called for every row, so skip building debug messages nobody will see
+        debug = self._logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            self._logger.debug(f"Formatting timestamp: {timestamp} (type: {type(timestamp)})")
         
         try:
             # Try to parse as Unix timestamp (milliseconds)
             if isinstance(timestamp, (int, float)):
-                if timestamp > 1e12:  # Milliseconds
-                    ts = timestamp / 1000.0
-                else:  # Seconds
-                    ts = timestamp
-                
-                dt = datetime.fromtimestamp(ts, tz=timezone.utc)
-                formatted = dt.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-                self._logger.debug(f"Formatted timestamp: {formatted}")
+                formatted = _fmt_epoch_ms(timestamp)
+                if debug:
+                    self._logger.debug(f"Formatted timestamp: {formatted}")
                 return formatted
             
             # Try to parse as string timestamp
             elif isinstance(timestamp, str):
-                # Try different timestamp formats
-                formats = [
-                    '%Y-%m-%d %H:%M:%S',
-                    '%Y-%m-%d %H:%M:%S.%f',
-                    '%Y-%m-%dT%H:%M:%S',
-                    '%Y-%m-%dT%H:%M:%S.%f',
-                    '%Y-%m-%dT%H:%M:%SZ',
-                    '%Y-%m-%dT%H:%M:%S.%fZ'
-                ]
-                
-                for fmt in formats:
-                    try:
-                        dt = datetime.strptime(timestamp, fmt)
-                        if dt.tzinfo is None:
-                            dt = dt.replace(tzinfo=timezone.utc)
-                        formatted = dt.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-                        self._logger.debug(f"Parsed string timestamp with format '{fmt}': {formatted}")
-                        return formatted
-                    except ValueError:
-                        continue
-                
-                # Try parsing as Unix timestamp string
-                try:
-                    ts = float(timestamp)
-                    if ts > 1e12:  # Milliseconds
-                        ts = ts / 1000.0
-                    dt = datetime.fromtimestamp(ts, tz=timezone.utc)
-                    formatted = dt.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-                    self._logger.debug(f"Parsed string as Unix timestamp: {formatted}")
+                # Legacy formats start with the last one that matched, rows in one table
+                # almost always share a format
+                formatted, fmt = _fmt_timestamp_str(timestamp, self._last_timestamp_format)
+                if formatted is not None:
+                    if fmt:
+                        self._last_timestamp_format = fmt
+                    if debug:
+                        self._logger.debug(f"Parsed string timestamp: {formatted}")
                     return formatted
-                except ValueError:
-                    pass
             
         except Exception as e:
             self._logger.error(f"Error formatting timestamp '{timestamp}': {e}")
@@ -879,36 +1218,41 @@ class HondaDecoder(BaseDecoder):
         
         # Return original value as string if parsing fails
         result = str(timestamp) if timestamp else ''
-        self._logger.debug(f"Failed to parse timestamp, returning as string: '{result}'")
+        if debug:
+            self._logger.debug(f"Failed to parse timestamp, returning as string: '{result}'")
         return result
     
+    def _create_temp_file(self, suffix: str) -> BinaryIO:
+        """Create a uniquely named, owner-only file in the decoder's temporary directory"""
+        if self._temp_dir is None:
+            self._temp_dir = tempfile.mkdtemp(prefix='honda_')
+            self._logger.debug(f"Created temporary directory: {self._temp_dir}")
+        path = os.path.join(self._temp_dir, f"extract_{next(self._temp_file_seq)}{suffix}")
+        
+        return open(path, 'wb', opener=lambda file, flags: os.open(file, flags, 0o600))
+    
     def _cleanup_temp_files(self):
-        """Clean up all temporary files using secure deletion"""
+        """Clean up the temporary directory and everything extracted into it using secure deletion"""
+        if self._temp_dir is None:
+            return
+        
         self._logger.info(f"Cleaning up {len(self.temp_files)} temporary files with secure deletion")
         
-        cleaned = 0
-        for temp_file in self.temp_files:
-            try:
-                if os.path.exists(temp_file):
-                    # Use secure deletion for temporary files
-                    from file_operations import secure_delete_file
-                    if secure_delete_file(temp_file):
-                        cleaned += 1
-                        self._logger.debug(f"Securely deleted temporary file: {temp_file}")
-                    else:
-                        self._logger.warning(f"Secure deletion failed for {temp_file}, attempting regular deletion")
-                        os.unlink(temp_file)
-                        cleaned += 1
-                        self._logger.debug(f"Deleted temporary file (regular): {temp_file}")
-            except Exception as e:
-                self._logger.error(f"Failed to delete temporary file {temp_file}: {e}")
-                pass
+        try:
+            from src.utils.file_operations import secure_delete_directory
+            if secure_delete_directory(self._temp_dir):
+                self._logger.debug(f"Securely deleted temporary directory: {self._temp_dir}")
+            else:
+                self._logger.warning(f"Secure deletion failed for {self._temp_dir}")
+        except Exception as e:
+            self._logger.error(f"Failed to delete temporary directory {self._temp_dir}: {e}")
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
         
-        self._logger.info(f"Cleaned up {cleaned}/{len(self.temp_files)} temporary files")
+        self._temp_dir = None
         self.temp_files.clear()
     
     def __del__(self):
         """Cleanup when object is destroyed"""
-        if hasattr(self, 'temp_files') and self.temp_files:
+        if getattr(self, '_temp_dir', None):
             self._logger.debug("Running cleanup in destructor")
             self._cleanup_temp_files()
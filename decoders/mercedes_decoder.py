@@ -1,6 +1,9 @@
 import sqlite3
 import struct
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
 from datetime import datetime, timezone
 from typing import List, Tuple, Optional, Any
 from src.core.base_decoder import BaseDecoder, GPSEntry
@@ -10,10 +13,97 @@ import time
 # Setup logger for this module
 logger = logging.getLogger(__name__)
 
+TRAILS_FETCH_SIZE = 5000  # Trails pulled from SQLite per fetchmany call
+TIMESTAMP_CACHE_SIZE = 8192  # Formatted trail times kept, end times often recur as the next begin time
+
+# Coordinates are stored as 32-bit integers scaled so that INT32_MAX is 180 degrees
+INT32_MAX = 2147483647  # 2^31 - 1
+
+# Precompiled little-endian layouts of the path blob fields
+_U16 = struct.Struct('<H')
+_U32 = struct.Struct('<I')
+_GPS_FIELDS = struct.Struct('<iiI')  # Longitude and latitude read as signed, then elevation
+
+# Total size of each non-GPS path event, counting its id byte and 4-byte distance. A GPS event (id 1) is 17
+_EVENT_SIZES = {
+    2: 9,   # Milliseconds since start
+    3: 13,  # 4 zero bytes then a timestamp
+    14: 5,  # No additional data
+    15: 9,
+    16: 5,  # No additional data
+    18: 6,
+}
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def _unix_to_utc_str(unix_timestamp) -> str:
+    """Format a Unix timestamp as 'YYYY-MM-DD HH:MM:SS.mmm' UTC, raising ValueError/OSError when out of range"""
+    dt = datetime.fromtimestamp(unix_timestamp, tz=timezone.utc)
+    # Built from the fields directly, same output as strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+    return (f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} "
+            f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}.{dt.microsecond // 1000:03d}")
+
+def _segment_ranges(path_data: bytes) -> List[Tuple[int, int]]:
+    """Read the segment size headers of a Mercedes path blob, returning each segment's (start, end) offsets"""
+    segments = []
+    data_len = len(path_data)
+    num_segments = _U16.unpack_from(path_data, 4)[0]
+    offset = 6
+    for segment_idx in range(num_segments):
+        if offset + 4 > data_len:
+            break
+        segment_end = offset + _U32.unpack_from(path_data, offset)[0]
+        if segment_end > data_len:
+            break
+        segments.append((offset, segment_end))
+        offset = segment_end
+    return segments
+
+def _scan_segment_events(path_data: bytes, segment_start: int, segment_end: int,
+                         raw_events: List[Tuple[int, int, int, int]]):
+    """Append the GPS events of one path segment to raw_events, reading in place at absolute offsets"""
+    unpack_gps = _GPS_FIELDS.unpack_from
+    append_event = raw_events.append
+    event_size = _EVENT_SIZES.get
+    pos = segment_start + 16
+    # Offsets past which an event header, or a whole GPS event, would run off the segment
+    header_limit = segment_end - 5
+    gps_limit = segment_end - 17
+    while pos < header_limit:
+        event_id = path_data[pos]
+        if event_id == 1:  # GPS coordinates after the id and a 4-byte distance
+            if pos > gps_limit:
+                break  # Truncated, and too few bytes remain for any later GPS event
+            append_event((pos, *unpack_gps(path_data, pos + 5)))
+            pos += 17
+        else:
+            # Other events are skipped whole. A truncated one can only sit in the last
+            # 17 bytes, where no further GPS event fits, so its payload is not bounds checked
+            size = event_size(event_id)
+            if size is None:
+                break  # Unknown event, stop parsing this segment
+            pos += size
+
+def _scan_path_events(path_data: bytes) -> List[Tuple[int, int, int, int]]:
+    """
+    Walk the segments of a Mercedes path blob and collect its GPS events
+    
+    Only the byte-level scan lives here, coordinate decoding is left to the caller. Fields
+    that never reach the output (distances, millisecond counters, timestamps) are skipped
+    over rather than unpacked. Segment boundaries come from their size headers alone, so
+    they are read first and each segment's events are then scanned independently.
+    
+    Returns:
+        List of (absolute offset, signed encoded longitude, signed encoded latitude, elevation) tuples
+    """
+    raw_events = []
+    for segment_start, segment_end in _segment_ranges(path_data):
+        _scan_segment_events(path_data, segment_start, segment_end, raw_events)
+    return raw_events
+
 class MercedesDecoder(BaseDecoder):
     def __init__(self):
         super().__init__()
-        self.INT32_MAX = 2147483647  # 2^31 - 1
+        self.INT32_MAX = INT32_MAX
         self._logger.info(f"MercedesDecoder initialized")
     
     def get_name(self) -> str:
@@ -42,16 +132,21 @@ class MercedesDecoder(BaseDecoder):
     
     def format_entry_for_xlsx(self, entry: GPSEntry) -> List[Any]:
         """Format a GPSEntry into a row for the XLSX file"""
-        self._logger.debug(f"Formatting entry for XLSX: lat={entry.latitude}, lon={entry.longitude}")
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(f"Formatting entry for XLSX: lat={entry.latitude}, lon={entry.longitude}")
 
+        # Read each field once, the exporters call this for every entry
+        get = entry.extra_data.get
+        latitude = entry.latitude
+        longitude = entry.longitude
         row = [
-            entry.extra_data.get('TrailId', ''),
-            entry.extra_data.get('BeginTime_UTC', ''),
-            entry.extra_data.get('EndTime_UTC', ''),
-            entry.longitude if entry.longitude != 0 else 'ERROR',
-            entry.latitude if entry.latitude != 0 else 'ERROR',
-            entry.extra_data.get('PathOffset', ''),
-            entry.extra_data.get('SourceTable', '')
+            get('TrailId', ''),
+            get('BeginTime_UTC', ''),
+            get('EndTime_UTC', ''),
+            longitude if longitude != 0 else 'ERROR',
+            latitude if latitude != 0 else 'ERROR',
+            get('PathOffset', ''),
+            get('SourceTable', '')
         ]
 
         return row
@@ -79,7 +174,7 @@ class MercedesDecoder(BaseDecoder):
                 self._logger.warning("Processing stopped by user before database open")
                 return [], "Processing stopped by user."
 
-            conn = sqlite3.connect(file_path)
+            conn = self._open_readonly(file_path)
             cursor = conn.cursor()
             
             if progress_callback:
@@ -91,18 +186,18 @@ class MercedesDecoder(BaseDecoder):
                 self._logger.warning("Processing stopped by user before trail read")
                 return [], "Processing stopped by user."
 
-            # Get all trails
-            cursor.execute("SELECT * FROM Trails")
-            trails = cursor.fetchall()
+            # Count the trails up front, the rows themselves are streamed in batches
+            cursor.execute("SELECT COUNT(*) FROM Trails")
+            trail_count = cursor.fetchone()[0]
+            # Only these four columns are used, selecting them by name lets rows be unpacked directly
+            cursor.execute("SELECT TrailId, BeginTime, EndTime, Path FROM Trails")
+            cursor.arraysize = TRAILS_FETCH_SIZE
             
-            # Get column names
-            column_names = [description[0] for description in cursor.description]
-            
-            self._logger.info(f"Found {len(trails)} trails in database")
+            self._logger.info(f"Found {trail_count} trails in database")
             
             if progress_callback:
-                progress_callback(f"Processing {len(trails)} trails...", 50)
-                self._log_progress(f"Processing {len(trails)} trails", 50)
+                progress_callback(f"Processing {trail_count} trails...", 50)
+                self._log_progress(f"Processing {trail_count} trails", 50)
                 
             if stop_event and stop_event.is_set():
                 conn.close()
@@ -110,103 +205,61 @@ class MercedesDecoder(BaseDecoder):
                 return [], "Processing stopped by user."
 
             entries = []
+            seen = set()  # Dedup keys of the entries kept so far
             valid_entries = 0
             invalid_entries = 0
+            stopped = False
+            debug = self._logger.isEnabledFor(logging.DEBUG)
+            # The bar only has 30 steps for this stage, so report about that often instead of per trail
+            report_step = max(1, trail_count // 30)
+            log_step = max(1, trail_count // 10)
             
-            for i, trail in enumerate(trails):
-                if stop_event and stop_event.is_set():
-                    conn.close()
-                    self._logger.warning(f"Processing stopped by user at trail {i}/{len(trails)}")
-                    return entries, "Processing stopped by user."
+            # SQLite releases the GIL while it steps through rows, so a worker thread reads
+            # the next batch of trails while this thread decodes the current one
+            with ThreadPoolExecutor(max_workers=1) as prefetcher:
+                for i, (trail_id, begin_time, end_time, path_data) in enumerate(self._prefetch_rows(cursor, prefetcher)):
+                    if stop_event and stop_event.is_set():
+                        self._logger.warning(f"Processing stopped by user at trail {i}/{trail_count}")
+                        stopped = True
+                        break
 
-                self._logger.debug(f"Processing trail {i+1}/{len(trails)}")
-                
-                trail_dict = dict(zip(column_names, trail))
-                
-                trail_id = trail_dict['TrailId']
-                begin_time = trail_dict['BeginTime']
-                end_time = trail_dict['EndTime']
-                path_data = trail_dict['Path']
-                
-                # Convert timestamps to ISO format
-                begin_time_iso = self.unix_to_iso(begin_time)
-                end_time_iso = self.unix_to_iso(end_time)
-                
-                # Decode path events
-                events = self.decode_path_events(path_data, begin_time) if path_data else []
-                
-                # Create base record
-                base_record = {
-                    'TrailId': trail_id,
-                    'BeginTime_UTC': begin_time_iso,
-                    'EndTime_UTC': end_time_iso
-                }
-                
-                # If no GPS events in path, just add the trail info
-                if not events:
-                    gps_entry = GPSEntry(
-                        latitude=0,
-                        longitude=0,
-                        timestamp=begin_time_iso if begin_time_iso else '',
-                        extra_data=base_record
-                    )
-                    entries.append(gps_entry)
-                    invalid_entries += 1
-                else:
-                    # Add each GPS event as a separate row
-                    for event in events:
-                        if self.is_valid_coordinates(event['latitude'], event['longitude']):
-                            gps_entry = GPSEntry(
-                                latitude=event['latitude'],
-                                longitude=event['longitude'],
-                                timestamp=begin_time_iso if begin_time_iso else '',
-                                extra_data={
-                                    **base_record,
-                                    'PathOffset': event.get('offset', ''),
-                                    'SourceTable': 'Trails',
-                                    'TrailId': trail_id
-                                }
-                            )
-                            entries.append(gps_entry)
-                            valid_entries += 1
-                        else:
-                            invalid_entries += 1
-                            self._logger.debug(f"Invalid coordinates in trail {trail_id}: {event['latitude']}, {event['longitude']}")
-
-                if progress_callback and len(trails) > 0:
-                    progress = 50 + (30 * (i + 1) // len(trails))
-                    progress_callback(f"Processing trail {i+1}/{len(trails)}", progress)
+                    if debug:
+                        self._logger.debug(f"Processing trail {i+1}/{trail_count}")
                     
-                    # Log progress every 10%
-                    if i % max(1, len(trails) // 10) == 0:
-                        self._log_progress(f"Processing trails ({i+1}/{len(trails)})", progress)
+                    trail_entries, trail_valid, trail_invalid = self._process_trail(trail_id, begin_time, end_time, path_data)
+                    # Drop duplicates as they are produced rather than in a pass at the end
+                    for entry in trail_entries:
+                        key = self._dedup_key(entry)
+                        if key not in seen:
+                            seen.add(key)
+                            entries.append(entry)
+                    valid_entries += trail_valid
+                    invalid_entries += trail_invalid
+
+                    if progress_callback and trail_count > 0 and (
+                            i % report_step == 0 or i % log_step == 0 or i + 1 == trail_count):
+                        progress = 50 + (30 * (i + 1) // trail_count)
+                        progress_callback(f"Processing trail {i+1}/{trail_count}", progress)
+                        
+                        # Log progress every 10%
+                        if i % log_step == 0:
+                            self._log_progress(f"Processing trails ({i+1}/{trail_count})", progress)
+            
+            if stopped:
+                conn.close()
+                return entries, "Processing stopped by user."
 
             conn.close()
             
             elapsed_time = time.time() - start_time
             self._logger.info(f"Processing complete. Valid entries: {valid_entries}, Invalid entries: {invalid_entries}")
             
-            # Deduplicate entries before returning
-            unique = set()
-            deduped_entries = []
-            for entry in entries:
-                # Use a tuple of identifying fields as the deduplication key
-                key = (
-                    round(entry.latitude, 7),  # rounding to avoid float precision issues
-                    round(entry.longitude, 7),
-                    entry.timestamp,
-                    tuple(sorted(entry.extra_data.items()))
-                )
-                if key not in unique:
-                    unique.add(key)
-                    deduped_entries.append(entry)
-
             if progress_callback:
                 progress_callback("Processing complete!", 90)
                 self._log_progress("Processing complete", 90)
 
-            self._log_extraction_complete(len(deduped_entries), elapsed_time)
-            return deduped_entries, None
+            self._log_extraction_complete(len(entries), elapsed_time)
+            return entries, None
 
         except sqlite3.Error as e:
             error_msg = f"SQLite database error: {str(e)}"
@@ -226,86 +279,180 @@ class MercedesDecoder(BaseDecoder):
             self._log_extraction_error(error_msg)
             return [], error_msg
     
+    def _open_readonly(self, file_path: str) -> sqlite3.Connection:
+        """
+        Open the database read-only, tuned for one sequential scan of its BLOBs
+        
+        The evidence file is never written to, so journal_mode and synchronous are left alone.
+        immutable=1 also skips locking, but only when no journal sits beside the database
+        that SQLite would need to apply.
+        """
+        uri = f"{Path(file_path).resolve().as_uri()}?mode=ro"
+        if not any(os.path.exists(file_path + suffix) for suffix in ('-wal', '-journal')):
+            uri += "&immutable=1"
+        # Rows are fetched on a worker thread, one at a time, so the connection may cross threads
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.executescript(
+            "PRAGMA temp_store=MEMORY;"
+            "PRAGMA mmap_size=268435456;"
+            "PRAGMA cache_size=-65536;"
+            "PRAGMA query_only=1;"
+        )
+        self._logger.debug(f"Opened {uri} read-only")
+        return conn
+    
+    def _prefetch_rows(self, cursor, executor):
+        """Yield the cursor's rows, fetching each next batch on the executor while the current one is consumed"""
+        pending = executor.submit(cursor.fetchmany)
+        while True:
+            rows = pending.result()
+            if not rows:
+                return
+            pending = executor.submit(cursor.fetchmany)
+            yield from rows
+    
+    @staticmethod
+    def _dedup_key(entry: GPSEntry) -> tuple:
+        """
+        Build the key identifying duplicate entries
+        
+        extra_data always has the same keys, so its values are read directly instead of
+        sorting its items.
+        """
+        extra = entry.extra_data
+        return (
+            round(entry.latitude, 7),  # rounding to avoid float precision issues
+            round(entry.longitude, 7),
+            entry.timestamp,
+            extra.get('TrailId'),
+            extra.get('BeginTime_UTC'),
+            extra.get('EndTime_UTC'),
+            extra.get('PathOffset'),
+            extra.get('SourceTable')
+        )
+    
+    def _process_trail(self, trail_id, begin_time, end_time, path_data) -> Tuple[List[GPSEntry], int, int]:
+        """
+        Convert one Trails row into GPS entries
+        
+        Returns:
+            Tuple of (entries, valid entry count, invalid entry count)
+        """
+        entries = []
+        valid_entries = 0
+        invalid_entries = 0
+        
+        # Convert timestamps to ISO format
+        begin_time_iso = self.unix_to_iso(begin_time)
+        end_time_iso = self.unix_to_iso(end_time)
+        
+        # Decode path events, as tuples since each one is read once and most become entries
+        events = self._decode_path_tuples(path_data) if path_data else []
+        
+        # Create base record
+        base_record = {
+            'TrailId': trail_id,
+            'BeginTime_UTC': begin_time_iso,
+            'EndTime_UTC': end_time_iso
+        }
+        
+        # If no GPS events in path, just add the trail info
+        if not events:
+            gps_entry = GPSEntry(
+                latitude=0,
+                longitude=0,
+                timestamp=begin_time_iso if begin_time_iso else '',
+                extra_data=base_record
+            )
+            entries.append(gps_entry)
+            invalid_entries += 1
+        else:
+            # Add each GPS event as a separate row
+            timestamp = begin_time_iso if begin_time_iso else ''
+            debug = self._logger.isEnabledFor(logging.DEBUG)
+            for event_start, lon, lat, _ in events:
+                # Same checks as is_valid_coordinates inline, decoded coordinates are never None
+                if -90 <= lat <= 90 and -180 <= lon <= 180 and (lat != 0 or lon != 0):
+                    # Written out rather than merged from base_record, which would copy it per event
+                    gps_entry = GPSEntry(
+                        latitude=lat,
+                        longitude=lon,
+                        timestamp=timestamp,
+                        extra_data={
+                            'TrailId': trail_id,
+                            'BeginTime_UTC': begin_time_iso,
+                            'EndTime_UTC': end_time_iso,
+                            'PathOffset': hex(event_start),
+                            'SourceTable': 'Trails'
+                        }
+                    )
+                    entries.append(gps_entry)
+                    valid_entries += 1
+                else:
+                    invalid_entries += 1
+                    if debug:
+                        self._logger.debug(f"Invalid coordinates in trail {trail_id}: {lat}, {lon}")
+        
+        return entries, valid_entries, invalid_entries
+    
     def decode_gps_coordinate(self, encoded_value):
         """
         Decode GPS coordinate from proprietary format
         Formula: decoded_value = encoded_value * 180 / Int32.MAX_VALUE
         """
-        # Convert unsigned to signed if necessary
-        if encoded_value > self.INT32_MAX:
-            encoded_value = encoded_value - 2**32
+        # Reinterpret the unsigned 32-bit value as signed: bit 31 set means subtract 2^32
+        encoded_value = encoded_value - ((encoded_value >> 31) << 32)
+        
+        return (encoded_value * 180.0) / INT32_MAX
+    
+    def decode_gps_coordinates(self, encoded_values) -> List[float]:
+        """
+        Decode a sequence of encoded coordinates at once, same formula as decode_gps_coordinate
         
-        return (encoded_value * 180.0) / self.INT32_MAX
+        The values must already be signed, the path scan unpacks them as int32 so no
+        unsigned-to-signed conversion is needed here.
+        """
+        return [(value * 180.0) / INT32_MAX for value in encoded_values]
     
     def decode_path_events(self, path_data, start_timestamp):
         """
         Decode the path binary data to extract GPS events
         Format: 04 01 01 00 + segments with various event types
         """
-        events = []
+        return [{
+            'longitude': lon,
+            'latitude': lat,
+            'elevation': elev,
+            'offset': hex(event_start)
+        } for event_start, lon, lat, elev in self._decode_path_tuples(path_data)]
+    
+    def _decode_path_tuples(self, path_data) -> List[Tuple[int, float, float, int]]:
+        """
+        Decode the GPS events of a path blob without building a dict per event
+        
+        Returns:
+            List of (absolute offset, longitude, latitude, elevation) tuples
+        """
         if len(path_data) < 8:
-            return events
+            return []
         try:
-            num_segments = struct.unpack('<H', path_data[4:6])[0]
-            offset = 6
-            for segment_idx in range(num_segments):
-                if offset + 4 > len(path_data):
-                    break
-                segment_size = struct.unpack('<I', path_data[offset:offset+4])[0]
-                if offset + segment_size > len(path_data):
-                    break
-                segment_data = path_data[offset:offset+segment_size]
-                event_offset = 16
-                while event_offset + 5 < len(segment_data):
-                    event_start = offset + event_offset  # Absolute offset in path_data
-                    event_id = segment_data[event_offset]
-                    distance = struct.unpack('<I', segment_data[event_offset+1:event_offset+5])[0]
-                    event_offset += 5
-                    if event_id == 1:  # GPS coordinates
-                        if event_offset + 12 <= len(segment_data):
-                            coords = struct.unpack('<3I', segment_data[event_offset:event_offset+12])
-                            lon = self.decode_gps_coordinate(coords[0])
-                            lat = self.decode_gps_coordinate(coords[1])
-                            elev = coords[2]
-                            events.append({
-                                'longitude': lon,
-                                'latitude': lat,
-                                'elevation': elev,
-                                'offset': hex(event_start)
-                            })
-                            event_offset += 12
-                    elif event_id == 2:  # Milliseconds since start
-                        if event_offset + 4 <= len(segment_data):
-                            millis = struct.unpack('<I', segment_data[event_offset:event_offset+4])[0]
-                            # Not used in output
-                            event_offset += 4
-                    elif event_id == 3:  # Timestamp
-                        if event_offset + 8 <= len(segment_data):
-                            # Skip 4 zero bytes, then read timestamp
-                            timestamp = struct.unpack('<I', segment_data[event_offset+4:event_offset+8])[0]
-                            # Not used in output
-                            event_offset += 8
-                    else:
-                        # Skip unknown events
-                        if event_id == 14 or event_id == 16:
-                            pass  # No additional data
-                        elif event_id == 15:
-                            event_offset += 4
-                        elif event_id == 18:
-                            event_offset += 1
-                        else:
-                            break  # Unknown event, stop parsing
-                offset += segment_size
+            raw_events = _scan_path_events(path_data)
         except struct.error as e:
             self._logger.error(f"Error decoding path events: {e}")
-        return events
+            return []
+        if not raw_events:
+            return []
+        # Decode both coordinate columns of the trail in one pass, then split them back
+        offsets, lons_encoded, lats_encoded, elevations = zip(*raw_events)
+        coordinates = self.decode_gps_coordinates(lons_encoded + lats_encoded)
+        event_count = len(offsets)
+        return list(zip(offsets, coordinates[:event_count], coordinates[event_count:], elevations))
     
     def unix_to_iso(self, unix_timestamp):
         """Convert Unix timestamp to ISO formatted UTC string"""
         if unix_timestamp and unix_timestamp > 0:
             try:
-                dt = datetime.fromtimestamp(unix_timestamp, tz=timezone.utc)
-                return dt.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+                return _unix_to_utc_str(unix_timestamp)
             except (ValueError, OSError):
                 self._logger.warning(f"Invalid Unix timestamp: {unix_timestamp}")
                 return None
@@ -9,11 +9,30 @@ import time
 # Setup logger for this module
 logger = logging.getLogger(__name__)
 
+# Field patterns compiled once, each tuple is tried in order by the *_flexible extractors
+GPS_TOW_PATTERNS = (re.compile(r'gps_tow=(\d+)'), re.compile(r'tow=(\d+)'))
+GPS_WEEK_PATTERNS = (re.compile(r'gps_week=(\d+)'), re.compile(r'week=(\d+)'))
+UTC_YEAR_PATTERNS = (re.compile(r'utc_year=(\d+)'), re.compile(r'year=(\d{4})'))
+UTC_MONTH_PATTERNS = (re.compile(r'utc_month=(\d+)'), re.compile(r'month=(\d+)'))
+UTC_DAY_PATTERNS = (re.compile(r'utc_day=(\d+)'), re.compile(r'day=(\d+)'))
+UTC_HOUR_PATTERNS = (re.compile(r'utc_hour=(\d+)'), re.compile(r'hour=(\d+)'))
+UTC_MIN_PATTERNS = (re.compile(r'utc_min=(\d+)'), re.compile(r'min=(\d+)'))
+LAT_HEX_PATTERNS = (re.compile(r'lat=([0-9A-Fa-f]{16})'), re.compile(r'lat=([0-9A-Fa-f\s]{16,})'))
+LON_HEX_PATTERNS = (re.compile(r'lon=([0-9A-Fa-f]{16})'), re.compile(r'lon=([0-9A-Fa-f\s]{16,})'))
+NON_HEX_RE = re.compile(r'[^0-9A-Fa-f]')
+COORD_DOUBLE = struct.Struct('<d')  # Coordinates are little-endian doubles scaled by 1e7
+
+# Keywords that mark a GPS record. Each gets its own literal pattern: the regex engine's literal
+# prefix search makes five scans faster than a single alternation, which it matches position by position
+GPS_KEYWORDS = (b'gps_tow=', b'gps_week=', b'utc_year=', b'lat=', b'lon=')
+GPS_KEYWORD_PATTERNS = tuple(re.compile(re.escape(keyword)) for keyword in GPS_KEYWORDS)
+
 class OnStarDecoder(BaseDecoder):
     def __init__(self):
         super().__init__()
         # GPS epoch start: January 6, 1980 00:00:00 UTC (first Sunday of 1980)
         self.gps_epoch = datetime(1980, 1, 6, 0, 0, 0, tzinfo=timezone.utc)
+        self._gps_epoch_ts = self.gps_epoch.timestamp()  # Constant, added to every block's GPS time
         self._logger.info(f"OnStarDecoder initialized with GPS epoch: {self.gps_epoch}")
     
     def get_name(self) -> str:
@@ -167,31 +186,21 @@ class OnStarDecoder(BaseDecoder):
         """Find GPS data blocks in binary data"""
         self._logger.debug("Starting binary search for GPS blocks")
         blocks = []
-        text_data = data.decode('latin-1', errors='ignore')
         
-        gps_patterns = [
-            b'gps_tow=',
-            b'gps_week=', 
-            b'utc_year=',
-            b'lat=',
-            b'lon='
-        ]
-        
-        self._logger.debug(f"Searching for patterns: {[p.decode('latin-1') for p in gps_patterns]}")
+        self._logger.debug(f"Searching for patterns: {[p.decode('latin-1') for p in GPS_KEYWORDS]}")
         
         keyword_positions = []
-        for pattern in gps_patterns:
-            pattern_str = pattern.decode('latin-1')
-            matches = list(re.finditer(re.escape(pattern_str), text_data))
-            self._logger.debug(f"Found {len(matches)} matches for pattern '{pattern_str}'")
-            
-            for match in matches:
-                keyword_positions.append(match.start())
+        for pattern in GPS_KEYWORD_PATTERNS:
+            # Searched in the raw bytes, the keywords are ASCII so no decoded copy of the file is needed
+            positions = [match.start() for match in pattern.finditer(data)]
+            self._logger.debug(f"Found {len(positions)} matches for pattern '{pattern.pattern.decode('latin-1')}'")
+            keyword_positions.extend(positions)
         
         if not keyword_positions:
             self._logger.warning("No GPS pattern matches found in file")
             return blocks
         
+        # Five sorted runs, which the sort merges cheaply
         keyword_positions.sort()
         self._logger.info(f"Found {len(keyword_positions)} total keyword positions")
         
@@ -208,8 +217,9 @@ class OnStarDecoder(BaseDecoder):
                 j += 1
             
             start_pos = max(0, block_start - 50)
-            end_pos = min(len(text_data), block_end + 50)
-            block_text = text_data[start_pos:end_pos]
+            end_pos = min(len(data), block_end + 50)
+            # latin-1 maps each byte to one character, so only the kept window needs decoding
+            block_text = data[start_pos:end_pos].decode('latin-1')
             blocks.append(block_text)
             
             self._logger.debug(f"Created block {len(blocks)}: positions {start_pos}-{end_pos} "
@@ -221,7 +231,10 @@ class OnStarDecoder(BaseDecoder):
     
     def parse_gps_block(self, block_text):
         """Parse a GPS data block into structured data"""
-        self._logger.debug(f"Parsing GPS block of length {len(block_text)}")
+        # Called once per block, so debug messages are only built when they will be emitted
+        debug = self._logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            self._logger.debug(f"Parsing GPS block of length {len(block_text)}")
         
         entry = {
             'lat': 'ERROR',
@@ -238,17 +251,18 @@ class OnStarDecoder(BaseDecoder):
         
         try:
             # Extract various fields
-            gps_tow = self.extract_number_flexible(block_text, [r'gps_tow=(\d+)', r'tow=(\d+)'])
-            gps_week = self.extract_number_flexible(block_text, [r'gps_week=(\d+)', r'week=(\d+)'])
-            utc_year = self.extract_number_flexible(block_text, [r'utc_year=(\d+)', r'year=(\d{4})'])
-            utc_month = self.extract_number_flexible(block_text, [r'utc_month=(\d+)', r'month=(\d+)'])
-            utc_day = self.extract_number_flexible(block_text, [r'utc_day=(\d+)', r'day=(\d+)'])
-            utc_hour = self.extract_number_flexible(block_text, [r'utc_hour=(\d+)', r'hour=(\d+)'])
-            utc_min = self.extract_number_flexible(block_text, [r'utc_min=(\d+)', r'min=(\d+)'])
+            gps_tow = self.extract_number_flexible(block_text, GPS_TOW_PATTERNS)
+            gps_week = self.extract_number_flexible(block_text, GPS_WEEK_PATTERNS)
+            utc_year = self.extract_number_flexible(block_text, UTC_YEAR_PATTERNS)
+            utc_month = self.extract_number_flexible(block_text, UTC_MONTH_PATTERNS)
+            utc_day = self.extract_number_flexible(block_text, UTC_DAY_PATTERNS)
+            utc_hour = self.extract_number_flexible(block_text, UTC_HOUR_PATTERNS)
+            utc_min = self.extract_number_flexible(block_text, UTC_MIN_PATTERNS)
             
-            self._logger.debug(f"Extracted time components: year={utc_year}, month={utc_month}, "
-                             f"day={utc_day}, hour={utc_hour}, min={utc_min}")
-            self._logger.debug(f"GPS time: week={gps_week}, tow={gps_tow}")
+            if debug:
+                self._logger.debug(f"Extracted time components: year={utc_year}, month={utc_month}, "
+                                 f"day={utc_day}, hour={utc_hour}, min={utc_min}")
+                self._logger.debug(f"GPS time: week={gps_week}, tow={gps_tow}")
             
             entry['utc_year'] = utc_year if utc_year is not None else ''
             entry['utc_month'] = utc_month if utc_month is not None else ''
@@ -257,11 +271,12 @@ class OnStarDecoder(BaseDecoder):
             entry['utc_min'] = utc_min if utc_min is not None else ''
             
             # Extract hex coordinates
-            lat_hex = self.extract_hex_flexible(block_text, [r'lat=([0-9A-Fa-f]{16})', r'lat=([0-9A-Fa-f\s]{16,})'])
-            lon_hex = self.extract_hex_flexible(block_text, [r'lon=([0-9A-Fa-f]{16})', r'lon=([0-9A-Fa-f\s]{16,})'])
+            lat_hex = self.extract_hex_flexible(block_text, LAT_HEX_PATTERNS)
+            lon_hex = self.extract_hex_flexible(block_text, LON_HEX_PATTERNS)
             
-            self._logger.debug(f"Extracted hex values: lat={lat_hex[:16] if lat_hex else 'None'}..., "
-                             f"lon={lon_hex[:16] if lon_hex else 'None'}...")
+            if debug:
+                self._logger.debug(f"Extracted hex values: lat={lat_hex[:16] if lat_hex else 'None'}..., "
+                                 f"lon={lon_hex[:16] if lon_hex else 'None'}...")
             
             entry['lat_hex'] = lat_hex if lat_hex else ''
             entry['lon_hex'] = lon_hex if lon_hex else ''
@@ -273,11 +288,12 @@ class OnStarDecoder(BaseDecoder):
                         gps_tow_sec = gps_tow / 1000.0
                         gps_week_sec = gps_week * 604800
                         total_seconds = gps_week_sec + gps_tow_sec
-                        gps_timestamp = self.gps_epoch.timestamp() + total_seconds
+                        gps_timestamp = self._gps_epoch_ts + total_seconds
                         dt = datetime.fromtimestamp(gps_timestamp, tz=timezone.utc)
                         entry['timestamp_time'] = dt.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
                         
-                        self._logger.debug(f"Converted GPS time to: {entry['timestamp_time']}")
+                        if debug:
+                            self._logger.debug(f"Converted GPS time to: {entry['timestamp_time']}")
                         
                         # Check if date is before 2010
                         if dt.year < 2010:
@@ -290,14 +306,14 @@ class OnStarDecoder(BaseDecoder):
             # Convert hex coordinates to decimal
             if lat_hex:
                 try:
-                    clean_hex = re.sub(r'[^0-9A-Fa-f]', '', lat_hex)
-                    if len(clean_hex) == 16:
-                        lat_bytes = bytes.fromhex(clean_hex)
-                        lat_raw = struct.unpack('<d', lat_bytes)[0]
+                    # extract_hex_flexible already returns exactly 16 hex digits, nothing to clean
+                    if len(lat_hex) == 16:
+                        lat_raw = COORD_DOUBLE.unpack(bytes.fromhex(lat_hex))[0]
                         lat_decimal = lat_raw / 10000000.0
                         if -90 <= lat_decimal <= 90:
                             entry['lat'] = lat_decimal
-                            self._logger.debug(f"Converted latitude: {lat_decimal}")
+                            if debug:
+                                self._logger.debug(f"Converted latitude: {lat_decimal}")
                         else:
                             self._logger.warning(f"Latitude out of range: {lat_decimal}")
                 except Exception as e:
@@ -306,14 +322,14 @@ class OnStarDecoder(BaseDecoder):
             
             if lon_hex:
                 try:
-                    clean_hex = re.sub(r'[^0-9A-Fa-f]', '', lon_hex)
-                    if len(clean_hex) == 16:
-                        lon_bytes = bytes.fromhex(clean_hex)
-                        lon_raw = struct.unpack('<d', lon_bytes)[0]
+                    # extract_hex_flexible already returns exactly 16 hex digits, nothing to clean
+                    if len(lon_hex) == 16:
+                        lon_raw = COORD_DOUBLE.unpack(bytes.fromhex(lon_hex))[0]
                         lon_decimal = lon_raw / 10000000.0
                         if -180 <= lon_decimal <= 180:
                             entry['long'] = lon_decimal
-                            self._logger.debug(f"Converted longitude: {lon_decimal}")
+                            if debug:
+                                self._logger.debug(f"Converted longitude: {lon_decimal}")
                         else:
                             self._logger.warning(f"Longitude out of range: {lon_decimal}")
                 except Exception as e:
@@ -326,8 +342,9 @@ class OnStarDecoder(BaseDecoder):
             if lon_hex:
                 entry['lon_hex'] = format_hex_with_spaces(lon_hex)
             
-            self._logger.debug(f"Block parsing complete. Valid coordinates: "
-                             f"{entry['lat'] != 'ERROR' and entry['long'] != 'ERROR'}")
+            if debug:
+                self._logger.debug(f"Block parsing complete. Valid coordinates: "
+                                 f"{entry['lat'] != 'ERROR' and entry['long'] != 'ERROR'}")
             return entry
             
         except Exception as e:
@@ -335,29 +352,31 @@ class OnStarDecoder(BaseDecoder):
             return None
     
     def extract_number_flexible(self, text, patterns):
-        """Extract a number using multiple regex patterns"""
+        """Extract a number using multiple compiled regex patterns, tried in order"""
         for pattern in patterns:
-            match = re.search(pattern, text)
+            match = pattern.search(text)
             if match:
                 try:
                     value = int(match.group(1))
-                    self._logger.debug(f"Pattern '{pattern}' matched: {value}")
+                    if self._logger.isEnabledFor(logging.DEBUG):
+                        self._logger.debug(f"Pattern '{pattern.pattern}' matched: {value}")
                     return value
                 except Exception as e:
-                    self._logger.debug(f"Failed to parse number from pattern '{pattern}': {e}")
+                    self._logger.debug(f"Failed to parse number from pattern '{pattern.pattern}': {e}")
                     continue
         return None
     
     def extract_hex_flexible(self, text, patterns):
-        """Extract hex value using multiple regex patterns"""
+        """Extract hex value using multiple compiled regex patterns, tried in order"""
         for pattern in patterns:
-            match = re.search(pattern, text)
+            match = pattern.search(text)
             if match:
                 hex_val = match.group(1)
-                clean_hex = re.sub(r'[^0-9A-Fa-f]', '', hex_val)
+                clean_hex = NON_HEX_RE.sub('', hex_val)
                 if len(clean_hex) >= 16:
                     result = clean_hex[:16]
-                    self._logger.debug(f"Pattern '{pattern}' matched hex value (first 16 chars)")
+                    if self._logger.isEnabledFor(logging.DEBUG):
+                        self._logger.debug(f"Pattern '{pattern.pattern}' matched hex value (first 16 chars)")
                     return result
         return None
     
@@ -401,5 +420,6 @@ class OnStarDecoder(BaseDecoder):
 def format_hex_with_spaces(hex_str):
     """Format hex string with spaces between bytes"""
     result = ' '.join(hex_str[i:i+2] for i in range(0, len(hex_str), 2))
-    logger.debug(f"Formatted hex string: {len(hex_str)} chars -> {len(result)} chars with spaces")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Formatted hex string: {len(hex_str)} chars -> {len(result)} chars with spaces")
     return result
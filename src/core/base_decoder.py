@@ -1,12 +1,24 @@
 from abc import ABC, abstractmethod
 from typing import List, Dict, Tuple, Optional, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 import logging
 from datetime import datetime
 
 # Setup logger for base_decoder module
 logger = logging.getLogger(__name__)
 
+def _with_slots(cls):
+    """Rebuild a dataclass with __slots__, as dataclass(slots=True) does but also before Python 3.10"""
+    cls_dict = dict(cls.__dict__)
+    field_names = tuple(f.name for f in fields(cls))
+    cls_dict['__slots__'] = field_names
+    # Defaults live in the generated __init__, the class attributes would clash with the slots
+    for name in field_names + ('__dict__', '__weakref__'):
+        cls_dict.pop(name, None)
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+# Decoders create one GPSEntry per position, slots drop the per-instance __dict__
+@_with_slots
 @dataclass
 class GPSEntry:
     """Standard GPS entry that all decoders must return"""
@@ -20,9 +32,11 @@ class GPSEntry:
         if self.extra_data is None:
             self.extra_data = {}
         
-        # Log creation of GPS entry
-        logger.debug(f"GPSEntry created: lat={self.latitude}, lon={self.longitude}, "
-                    f"timestamp={self.timestamp}, extra_data_keys={list(self.extra_data.keys())}")
+        # Log creation of GPS entry, only building the message when it will be emitted
+        # since decoders create one entry per position
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"GPSEntry created: lat={self.latitude}, lon={self.longitude}, "
+                        f"timestamp={self.timestamp}, extra_data_keys={list(self.extra_data.keys())}")
 
 class BaseDecoder(ABC):
     """Abstract base class for all vehicle telematics decoders"""
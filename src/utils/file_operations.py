@@ -19,6 +19,7 @@ from pathlib import Path
 from datetime import datetime
 from typing import List
 from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
 
 logger = logging.getLogger(__name__)
 
@@ -412,14 +413,17 @@ def write_excel_report(entries: List, output_path: str, decoder_name: str, syste
         )
         return
     
-    # Default single-sheet export for other decoders
-    wb = Workbook()
+    # Default single-sheet export for other decoders. Write-only mode streams each row to disk
+    # instead of keeping a cell object per value, so column widths must be set before any row
+    wb = Workbook(write_only=True)
     
     # Main GPS Data worksheet
-    ws_data = wb.active
-    ws_data.title = "GPS Data"
+    ws_data = wb.create_sheet("GPS Data")
     
     headers = decoder_instance.get_xlsx_headers()
+    # Size data columns from the header names rather than walking every cell
+    for idx, name in enumerate(headers, 1):
+        ws_data.column_dimensions[get_column_letter(idx)].width = min(max(len(name), 20) + 2, 50)
     ws_data.append(headers)
 
     for entry in entries:
@@ -428,6 +432,9 @@ def write_excel_report(entries: List, output_path: str, decoder_name: str, syste
     
     # Create Extraction Details worksheet
     ws_details = wb.create_sheet("Extraction Details")
+    ws_details.column_dimensions['A'].width = 25
+    ws_details.column_dimensions['B'].width = 50
+    ws_details.column_dimensions['C'].width = 70
       # Write extraction details
     ws_details.append(["FENDER Extraction Report"])
     ws_details.append([])
@@ -488,11 +495,6 @@ def write_excel_report(entries: List, output_path: str, decoder_name: str, syste
     ws_details.append(["Entries Extracted", extraction_info["extraction_details"]["entries_extracted"]])
     ws_details.append(["Processing Time (seconds)", extraction_info["extraction_details"]["processing_time_seconds"]])
     
-    # Format the details worksheet
-    ws_details.column_dimensions['A'].width = 25
-    ws_details.column_dimensions['B'].width = 50
-    ws_details.column_dimensions['C'].width = 70
-    
     wb.save(output_path)
     logger.info(f"Excel report written successfully: {output_path}")
 